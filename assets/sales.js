@@ -0,0 +1,199 @@
+// Client-Side Callbacks For The Sales Page (DASHBOARD_CLIENTSIDE=1)
+// Every figure is rebuilt from the aggregates in the "sales-aggregates" store,
+// so switching years never reaches the server.
+(function () {
+    var userColors = ["#1879F4", "#FFED8F", "#2ED381", "#EC3636", "#32E0C4", "#FBA408"];
+    var monthNames = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"];
+    var insideFont = function (size) {
+        return {family: "consolas", size: size};
+    };
+
+    // ----------- Helpers
+    function requireData(data) {
+        if (!data) {
+            throw window.dash_clientside.PreventUpdate;
+        }
+    }
+
+    // Values Of One Year, Or Summed Over All Years
+    function pick(values, option) {
+        if (option !== "all") {
+            return values[String(option)] || [];
+        }
+        var total = null;
+        Object.keys(values).forEach(function (year) {
+            total = total ? total.map(function (x, i) { return x + values[year][i]; }) : values[year].slice();
+        });
+        return total || [];
+    }
+
+    // Drop Empty Groups And Sort By Value
+    function sortedPairs(marginal, option, descending) {
+        var values = pick(marginal.values, option);
+        var pairs = marginal.labels
+            .map(function (label, i) { return [label, values[i]]; })
+            .filter(function (pair) { return pair[1] > 0; });
+        pairs.sort(function (a, b) { return descending ? b[1] - a[1] : a[1] - b[1]; });
+        return pairs;
+    }
+
+    function column(pairs, i) {
+        return pairs.map(function (pair) { return pair[i]; });
+    }
+
+    function layout(data, title, xTitle, yTitle) {
+        return {
+            template: data.template,
+            title: {text: title},
+            showlegend: false,
+            xaxis: {title: {text: xTitle}},
+            yaxis: {title: {text: yTitle}}
+        };
+    }
+
+    function suffix(option, text) {
+        return option === "all" ? "" : text + option;
+    }
+
+    // Same As Python's "{:,.0f}"
+    function formatCount(value) {
+        return Math.round(value).toLocaleString("en-US");
+    }
+
+    // ----------- Callbacks
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        sales: {
+            // Totals Of Each Year Option (Prefix Sums Of The Date Index, On The Server)
+            cards: function (option, data) {
+                requireData(data);
+                var cards = data.cards, key = String(option);
+                if (!(key in cards.customers)) {
+                    throw window.dash_clientside.PreventUpdate;
+                }
+                return [formatCount(cards.total_price[key]), formatCount(cards.quantity[key]), formatCount(cards.customers[key])];
+            },
+
+            line: function (option, data) {
+                requireData(data);
+                if (option === "all") {
+                    var years = data.years.map(String);
+                    return {
+                        data: [{
+                            type: "bar", x: years, y: years.map(function (year) { return data.total_price[year]; }),
+                            marker: {color: years.map(function (_, i) { return i === years.length - 1 ? "darkcyan" : "#1879F4"; })},
+                            texttemplate: "%{y:.4s}", textposition: "inside", insidetextfont: insideFont(20)
+                        }],
+                        layout: layout(data, "Total Sales Per Year (Geoupped Match Months Together in Each Year)",
+                                       "Year", "Total Price in Liras")
+                    };
+                }
+
+                var months = sortedPairs(data.month, option, false).sort(function (a, b) { return a[0] - b[0]; });
+                return {
+                    data: [{
+                        type: "scatter", mode: "lines+markers", marker: {color: userColors[0]},
+                        x: months.map(function (pair) { return monthNames[Number(pair[0]) - 1]; }), y: column(months, 1)
+                    }],
+                    layout: layout(data, "Total Sales Per Month via Year " + option, "Months of " + option, "Total Price in Liras")
+                };
+            },
+
+            pieBar: function (option, data) {
+                requireData(data);
+                var gender = sortedPairs(data.gender, option, true);
+                var category = sortedPairs(data.category, option, false);
+
+                var pie = {
+                    data: [{
+                        type: "pie", labels: column(gender, 0), values: column(gender, 1), hole: 0.5,
+                        marker: {colors: userColors}, textposition: "inside", insidetextfont: insideFont(20)
+                    }],
+                    layout: layout(data, "Total Sales Per Gender" + suffix(option, " via Year "), "", "")
+                };
+                pie.layout.showlegend = true;
+
+                var bar = {
+                    data: [{
+                        type: "bar", orientation: "h", x: column(category, 1), y: column(category, 0),
+                        marker: {color: userColors[0]}, texttemplate: "%{x:.3s}", textposition: "inside",
+                        insidetextfont: insideFont(15)
+                    }],
+                    layout: layout(data, "Sold Quantity Per Category" + suffix(option, " via Year "), "Quantity Sold", "Category")
+                };
+                return [pie, bar];
+            },
+
+            bars: function (option, data) {
+                requireData(data);
+                var payment = sortedPairs(data.payment_method, option, true);
+                var malls = sortedPairs(data.shopping_mall, option, true);
+
+                var paymentFig = {
+                    data: [{
+                        type: "bar", x: column(payment, 0), y: column(payment, 1),
+                        marker: {color: userColors.slice(0, payment.length)}, texttemplate: "%{y:.4s}",
+                        textposition: "inside", insidetextfont: insideFont(15)
+                    }],
+                    layout: layout(data, option === "all" ? "Popularity of Each Payment Methods"
+                                                          : "Popularity of Payment Methods via Year " + option,
+                                   "Payment Method", "Frequncey")
+                };
+
+                var mallsFig = {
+                    data: [{
+                        type: "bar", orientation: "h", x: column(malls, 1), y: column(malls, 0),
+                        marker: {color: "#1879F4"}, texttemplate: "%{x:.3s}", textposition: "inside",
+                        insidetextfont: insideFont(15)
+                    }],
+                    layout: layout(data, option === "all" ? "Total Sales For Each Shopping Malls"
+                                                          : "Total Sales For Shopping Malls In Year " + option,
+                                   "Total Sales In Liras", "Shopping Mall")
+                };
+                return [paymentFig, mallsFig];
+            },
+
+            // Box From Precomputed Percentiles (Whiskers At 5% & 95%) & Age Histogram
+            distributions: function (option, data) {
+                requireData(data);
+                var current = data.distributions[String(option)];
+                if (!current) {
+                    throw window.dash_clientside.PreventUpdate;
+                }
+
+                var quantiles = current.quantiles;
+                var boxFig = {
+                    data: [{
+                        type: "box", x: current.categories, lowerfence: quantiles[0], q1: quantiles[1],
+                        median: quantiles[2], q3: quantiles[3], upperfence: quantiles[4], marker: {color: userColors[0]}
+                    }],
+                    layout: layout(data, option === "all" ? "Price Percentiles Per Category (5-25-50-75-95%)"
+                                                          : "Price Percentiles Per Category via Year " + option,
+                                   "Category", "Price in Liras")
+                };
+                boxFig.layout.yaxis.type = "log";
+
+                // First Age Where Half The Invoices Are Reached
+                var total = current.invoices.reduce(function (sum, count) { return sum + count; }, 0);
+                var running = 0, medianAge = current.ages[current.ages.length - 1];
+                for (var i = 0; i < current.ages.length; i++) {
+                    running += current.invoices[i];
+                    if (running >= total / 2) {
+                        medianAge = current.ages[i];
+                        break;
+                    }
+                }
+
+                var ageFig = {
+                    data: [{
+                        type: "bar", x: current.ages, y: current.invoices, marker: {color: userColors[2]},
+                        hovertemplate: "Age=%{x}<br>Invoices=%{y}<extra></extra>"
+                    }],
+                    layout: layout(data, "Invoices Per Customer Age" + suffix(option, " via Year ") + " (Median " + medianAge + ")",
+                                   "Age", "Invoices")
+                };
+                ageFig.layout.bargap = 0.05;
+                return [boxFig, ageFig];
+            }
+        }
+    });
+})();
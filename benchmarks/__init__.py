@@ -0,0 +1 @@
+# Benchmarks For Data Loading & Page Callbacks
@@ -0,0 +1,59 @@
+# Importing Libraries
+import sys
+import json
+import argparse
+
+
+# ----------- Flatten A Results File Into {(rows, metric): seconds}
+# Callback benchmarks (benchmarks.run) and load tests (benchmarks.load)
+def flatten(results):
+    metrics = {}
+    for scale in results.get("scales", []):
+        for name, step in scale["steps"].items():
+            metrics[(scale["rows"], name)] = step["seconds"]
+        for name, callback in scale["callbacks"].items():
+            metrics[(scale["rows"], name)] = callback["median_ms"] / 1000
+
+    for run in results.get("runs", []):
+        name = f"load workers={run['workers']} users={run['users']}"
+        for percentile in ("p50", "p95", "p99"):
+            if percentile in run["latency_ms"]:
+                metrics[(run["rows"] or 0, f"{name} {percentile}")] = run["latency_ms"][percentile] / 1000
+    return metrics
+
+
+def compare(baseline, candidate, threshold):
+    old, new = flatten(baseline), flatten(candidate)
+    regressions = []
+
+    print(f"{'rows':>12}  {'metric':<70} {'before':>10} {'after':>10} {'change':>8}")
+    for key in sorted(old.keys() & new.keys(), key=str):
+        change = new[key] / old[key] - 1 if old[key] else 0.0
+        flag = " !" if change > threshold else ""
+        print(f"{key[0]:>12,}  {key[1]:<70} {old[key] * 1000:>9.1f}ms {new[key] * 1000:>9.1f}ms {change:>+7.0%}{flag}")
+        if flag:
+            regressions.append(key)
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.20, help="Relative slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    regressions = compare(baseline, candidate, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# Importing Libraries
+import os
+import argparse
+
+import numpy as np
+import pandas as pd
+
+
+# ----------- Realistic Cardinalities (Same Values As The Real Export)
+MALLS = ["Kanyon", "Forum Istanbul", "Metrocity", "Metropol AVM", "Istinye Park",
+         "Mall of Istanbul", "Emaar Square Mall", "Cevahir AVM", "Viaport Outlet", "Zorlu Center"]
+MALL_WEIGHTS = [0.20, 0.15, 0.15, 0.10, 0.10, 0.10, 0.05, 0.05, 0.05, 0.05]
+
+# Unit Price Per Category; The Export's price Column Is Unit Price * Quantity
+CATEGORIES = {"Clothing": 300.08, "Cosmetics": 40.66, "Food & Beverage": 5.23, "Toys": 35.84,
+              "Shoes": 600.17, "Souvenir": 11.73, "Technology": 1050.0, "Books": 15.15}
+CATEGORY_WEIGHTS = [0.35, 0.15, 0.15, 0.10, 0.10, 0.05, 0.05, 0.05]
+
+PAYMENT_METHODS = ["Cash", "Credit Card", "Debit Card"]
+PAYMENT_WEIGHTS = [0.45, 0.35, 0.20]
+
+COLUMNS = ["invoice_no", "customer_id", "gender", "age", "category", "quantity",
+           "price", "payment_method", "invoice_date", "shopping_mall"]
+
+
+# ----------- Generate One Chunk Of Rows
+def generate_chunk(rng, start, rows, first_day, days, customers):
+    category_names = np.array(list(CATEGORIES))
+    unit_prices = np.array(list(CATEGORIES.values()))
+
+    category = rng.choice(len(category_names), rows, p=CATEGORY_WEIGHTS)
+    quantity = rng.integers(1, 6, rows)
+    # Format Each Calendar Day Once, Then Gather
+    day_labels = pd.date_range(first_day, periods=days).strftime("%d/%m/%Y").to_numpy()
+
+    return pd.DataFrame({
+        "invoice_no": np.char.add("I", np.arange(start, start + rows).astype(str)),
+        "customer_id": np.char.add("C", rng.integers(100000, 100000 + customers, rows).astype(str)),
+        "gender": rng.choice(["Female", "Male"], rows, p=[0.6, 0.4]),
+        "age": rng.integers(18, 70, rows),
+        "category": category_names[category],
+        "quantity": quantity,
+        "price": np.round(unit_prices[category] * quantity, 2),
+        "payment_method": rng.choice(PAYMENT_METHODS, rows, p=PAYMENT_WEIGHTS),
+        "invoice_date": day_labels[rng.integers(0, days, rows)],
+        "shopping_mall": rng.choice(MALLS, rows, p=MALL_WEIGHTS),
+    }, columns=COLUMNS)
+
+
+# Written in chunks so 100M-row files never need 100M rows in memory;
+# the same seed always produces the same file.
+def generate(path, rows, seed=0, first_day="2021-01-01", last_day="2023-03-08",
+             customers=None, chunk_rows=1_000_000):
+    rng = np.random.default_rng(seed)
+    days = int((np.datetime64(last_day) - np.datetime64(first_day)).astype(int)) + 1
+    customers = customers or max(1, int(rows * 0.9))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    for start in range(0, rows, chunk_rows):
+        chunk = generate_chunk(rng, start, min(chunk_rows, rows - start), first_day, days, customers)
+        chunk.to_csv(path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic customer_shopping_data.csv")
+    parser.add_argument("path", nargs="?", default="customer_shopping_data.csv")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--customers", type=int, default=None)
+    args = parser.parse_args()
+
+    generate(args.path, args.rows, seed=args.seed, customers=args.customers)
+
+
+if __name__ == "__main__":
+    main()
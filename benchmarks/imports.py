@@ -0,0 +1,75 @@
+# Importing Libraries
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+
+# Runs In A Fresh Interpreter: Import The App, Then Serve The First Page
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+data_loaded = "dashboard.data" in sys.modules and sys.modules["dashboard.data"]._df is not None
+main.server.test_client().get("/")
+sys.modules["pages.home"].layout()
+print(json.dumps({"import_seconds": imported - start, "first_page_seconds": time.perf_counter() - imported,
+                  "data_loaded_at_import": data_loaded,
+                  "plotly_express_at_import": "plotly.express" in sys.modules}))
+"""
+
+
+# ----------- Parse `python -X importtime` Output
+# Lines look like "import time:  self [us] | cumulative | imported package"
+def parse_importtime(stderr):
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    return modules
+
+
+def measure(env=None):
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        capture_output=True, text=True, check=True, env=dict(os.environ, **(env or {})),
+    )
+    report = json.loads(completed.stdout.strip().splitlines()[-1])
+    report["modules"] = parse_importtime(completed.stderr)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report where app import time goes")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    report = measure()
+    print(f"import main:           {report['import_seconds'] * 1000:9.1f}ms")
+    print(f"first page (+ data):   {report['first_page_seconds'] * 1000:9.1f}ms")
+    print(f"data loaded at import: {report['data_loaded_at_import']}")
+    print(f"plotly.express eager:  {report['plotly_express_at_import']}")
+
+    # Direct Imports Only, So Nested Modules Are Not Counted Twice
+    top_level = [module for module in report["modules"] if module["depth"] <= 1]
+    print(f"\n{'module':<50} {'cumulative':>12} {'self':>10}")
+    for module in sorted(top_level, key=lambda module: -module["cumulative_ms"])[:args.top]:
+        print(f"{module['module']:<50} {module['cumulative_ms']:>10.1f}ms {module['self_ms']:>8.1f}ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
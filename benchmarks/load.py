@@ -0,0 +1,421 @@
+# Importing Libraries
+import os
+import sys
+import gzip
+import json
+import time
+import random
+import socket
+import argparse
+import threading
+import contextlib
+import subprocess
+import http.client
+from datetime import datetime
+
+import numpy as np
+
+from benchmarks.generate import generate
+from benchmarks.run import environment
+
+
+DEFAULT_SCALES = [100_000, 1_000_000]
+DEFAULT_WORKERS = [1, 2, 4]
+
+# Pages A Simulated User Visits And The Menu They Play With There
+SCENARIOS = {"/": "year-menu", "/malls": "malls-menu", "/customers": "customers-gender-menu"}
+
+PAGES_CALLBACK = ".._pages_content.children..._pages_store.data.."
+
+# Works With Every gunicorn Version (Older Ones Have No `python -m gunicorn`)
+GUNICORN = "import sys; from gunicorn.app.wsgiapp import run; sys.argv[0] = 'gunicorn'; run()"
+
+
+# ----------- Dash Protocol Helpers
+def output_props(output):
+    if output.startswith(".."):
+        return output.strip(".").split("...")
+    return [output]
+
+
+def prop_key(item):
+    return f"{item['id']}.{item['property']}"
+
+
+# Every id'd component of a layout -> its props (children excluded)
+def walk(node, props):
+    if isinstance(node, list):
+        for child in node:
+            walk(child, props)
+    elif isinstance(node, dict) and "props" in node:
+        component_id = node["props"].get("id")
+        for name, value in node["props"].items():
+            if isinstance(component_id, str) and name != "children":
+                props[f"{component_id}.{name}"] = value
+            walk(value, props)
+    return props
+
+
+def option_values(options):
+    return [option["value"] if isinstance(option, dict) else option for option in options or []]
+
+
+# ----------- One Simulated Browser
+# Follows /_dash-dependencies the way the Dash renderer does: a page is the
+# pages callback plus every initial callback of its components, and each
+# response fires the callbacks that take the changed props as inputs.
+class Session:
+    def __init__(self, host, port, rng, record):
+        self.connection = http.client.HTTPConnection(host, port, timeout=300)
+        self.rng = rng
+        self.record = record
+        self.dependencies = None
+        self.props = {}
+        self.ids = set()
+
+    def request(self, kind, method, path, body=None):
+        headers = {"Accept-Encoding": "gzip"}
+        if body is not None:
+            body = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+
+        start = time.perf_counter()
+        try:
+            self.connection.request(method, path, body, headers)
+            response = self.connection.getresponse()
+            status, data = response.status, response.read()
+            if response.getheader("Content-Encoding") == "gzip":
+                data = gzip.decompress(data)
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            status, data = 0, b""
+
+        self.record(kind, start, time.perf_counter() - start, status)
+        return status, data
+
+    # Server-side callbacks whose outputs are all on the current page
+    def callbacks(self):
+        for dependency in self.dependencies:
+            if dependency.get("clientside_function") or dependency["output"] == PAGES_CALLBACK:
+                continue
+            if all(key.rsplit(".", 1)[0] in self.ids for key in output_props(dependency["output"])):
+                yield dependency
+
+    def post_callback(self, dependency, changed):
+        outputs = [dict(zip(("id", "property"), key.rsplit(".", 1))) for key in output_props(dependency["output"])]
+        body = {
+            "output": dependency["output"],
+            "outputs": outputs if dependency["output"].startswith("..") else outputs[0],
+            "inputs": [dict(item, value=self.props.get(prop_key(item))) for item in dependency["inputs"]],
+            "changedPropIds": [prop_key(item) for item in dependency["inputs"] if prop_key(item) in changed],
+            "state": [dict(item, value=self.props.get(prop_key(item))) for item in dependency.get("state", [])],
+        }
+
+        status, data = self.request(f"callback {dependency['output']}", "POST", "/_dash-update-component", body)
+        if status != 200:
+            return set()
+
+        updated = set()
+        for component_id, values in json.loads(data).get("response", {}).items():
+            for name, value in values.items():
+                self.props[f"{component_id}.{name}"] = value
+                updated.add(f"{component_id}.{name}")
+        return updated
+
+    # Callbacks wait for pending callbacks that produce their inputs
+    def settle(self, pending, changed):
+        for _ in range(10):
+            if not pending:
+                return
+
+            produced = {key for dependency in pending for key in output_props(dependency["output"])}
+            ready = [dependency for dependency in pending
+                     if not any(prop_key(item) in produced for item in dependency["inputs"])] or pending
+
+            updated = set()
+            for dependency in ready:
+                updated |= self.post_callback(dependency, changed)
+
+            pending = [dependency for dependency in pending if dependency not in ready]
+            pending += [dependency for dependency in self.callbacks() if dependency not in pending
+                        and any(prop_key(item) in updated for item in dependency["inputs"])]
+            changed = updated
+
+    # A full page load the first time, in-app navigation afterwards
+    def open(self, path):
+        start = time.perf_counter()
+        if self.dependencies is None:
+            self.request("page", "GET", path)
+            self.request("layout", "GET", "/_dash-layout")
+            status, data = self.request("dependencies", "GET", "/_dash-dependencies")
+            self.dependencies = json.loads(data) if status == 200 else []
+
+        self.props = {"_pages_location.pathname": path, "_pages_location.search": ""}
+        pages = next((dependency for dependency in self.dependencies if dependency["output"] == PAGES_CALLBACK), None)
+        if pages is not None:
+            self.post_callback(pages, {"_pages_location.pathname"})
+            walk(self.props.get("_pages_content.children"), self.props)
+        self.ids = {key.rsplit(".", 1)[0] for key in self.props}
+
+        self.settle([dependency for dependency in self.callbacks() if not dependency.get("prevent_initial_call")], set())
+        self.record("action open", start, time.perf_counter() - start, 200)
+
+    # Pick another value in a dropdown (a random subset for multi-selects)
+    def choose(self, menu):
+        options = option_values(self.props.get(f"{menu}.options"))
+        if not options:
+            return
+
+        start = time.perf_counter()
+        if self.props.get(f"{menu}.multi"):
+            value = self.rng.sample(options, self.rng.randint(0, min(3, len(options))))
+        else:
+            value = self.rng.choice(options)
+
+        key = f"{menu}.value"
+        self.props[key] = value
+        self.settle([dependency for dependency in self.callbacks()
+                     if any(prop_key(item) == key for item in dependency["inputs"])], {key})
+        self.record("action choose", start, time.perf_counter() - start, 200)
+
+
+# ----------- Simulated Users
+# Each user opens a page, changes its menu a few times with think time in
+# between, then moves on to another page; a new browser session is started
+# after every few pages.
+def user(host, port, seed, deadline, think, record):
+    rng = random.Random(seed)
+    while time.perf_counter() < deadline:
+        session = Session(host, port, rng, record)
+        for _ in range(rng.randint(1, 4)):
+            path = rng.choice(list(SCENARIOS))
+            session.open(path)
+            for _ in range(rng.randint(2, 5)):
+                if time.perf_counter() >= deadline:
+                    return
+                time.sleep(rng.expovariate(1 / think) if think else 0)
+                session.choose(SCENARIOS[path])
+        session.connection.close()
+
+
+def percentiles(durations):
+    if not durations:
+        return {"count": 0}
+    values = np.percentile(np.asarray(durations) * 1000, [50, 95, 99])
+    return {"count": len(durations), "p50": values[0], "p95": values[1], "p99": values[2],
+            "max": max(durations) * 1000}
+
+
+def drive(host, port, users, duration, ramp, think, seed=0):
+    samples = []
+    lock = threading.Lock()
+
+    def record(kind, start, seconds, status):
+        with lock:
+            samples.append((kind, start, seconds, status))
+
+    begin = time.perf_counter()
+    threads = [threading.Thread(target=user, args=(host, port, seed + i, begin + ramp + duration, think, record), daemon=True)
+               for i in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Requests Started During The Ramp-Up Are Left Out
+    measured = [sample for sample in samples if sample[1] >= begin + ramp]
+    requests = [sample for sample in measured if not sample[0].startswith("action")]
+    actions = [sample for sample in measured if sample[0].startswith("action")]
+
+    callbacks = {}
+    for kind, _, seconds, _ in requests:
+        if kind.startswith("callback "):
+            callbacks.setdefault(kind[len("callback "):], []).append(seconds)
+
+    return {
+        "requests": len(requests),
+        "errors": sum(1 for sample in requests if sample[3] not in (200, 204)),
+        "throughput_rps": len(requests) / duration,
+        "actions_per_s": len(actions) / duration,
+        "latency_ms": percentiles([sample[2] for sample in requests]),
+        "actions_ms": percentiles([sample[2] for sample in actions]),
+        "callbacks_ms": {output: percentiles(durations) for output, durations in sorted(callbacks.items())},
+    }
+
+
+# ----------- Worker Memory (Linux /proc)
+# Workers map the same read-only column store, so RSS counts the shared pages
+# in every worker; PSS splits them between the processes sharing them.
+def process_memory(pid):
+    memory = {"pid": pid}
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith(("VmRSS:", "VmHWM:")):
+                    memory["rss_mb" if line.startswith("VmRSS") else "peak_rss_mb"] = int(line.split()[1]) / 1024
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    memory["pss_mb"] = int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return memory
+
+
+def child_pids(parent):
+    children = []
+    for entry in os.listdir("/proc") if os.path.isdir("/proc") else []:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        if ppid == parent:
+            children.append(int(entry))
+    return sorted(children)
+
+
+def server_memory(master):
+    return {"master": process_memory(master), "workers": [process_memory(pid) for pid in child_pids(master)]}
+
+
+# ----------- Local gunicorn Instance
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(port, process, timeout):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {process.returncode}")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            connection.request("GET", "/_dash-layout")
+            if connection.getresponse().status == 200:
+                return
+        except (OSError, http.client.HTTPException):
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"gunicorn not ready after {timeout}s")
+
+
+@contextlib.contextmanager
+def serve(rows, workers, workdir, timeout):
+    data_path = os.path.join(workdir, f"customer_shopping_data_{rows}.csv")
+    if not os.path.exists(data_path):
+        generate(data_path, rows)
+
+    port = free_port()
+    env = dict(os.environ, DASHBOARD_DATA_PATH=data_path, DASHBOARD_CACHE_DIR=os.path.join(workdir, f"cache_{rows}"),
+               DASHBOARD_INGEST_DIR=os.path.join(workdir, f"incoming_{rows}"), DASHBOARD_INGEST_POLL_SECONDS="0",
+               DASHBOARD_BIND=f"127.0.0.1:{port}", WEB_CONCURRENCY=str(workers))
+
+    with open(os.path.join(workdir, f"gunicorn_{rows}_{workers}.log"), "w") as log:
+        process = subprocess.Popen([sys.executable, "-c", GUNICORN, "-c", "gunicorn.conf.py", "main:server"],
+                                   env=env, stdout=log, stderr=subprocess.STDOUT)
+        try:
+            wait_ready(port, process, timeout)
+            yield port, process.pid
+        finally:
+            process.terminate()
+            try:
+                process.wait(30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+# ----------- Capacity Report
+# Per dataset size: the configuration with the highest throughput whose p95
+# stays within the target and that had no errors.
+def capacity(runs, target_ms):
+    report = []
+    for rows in sorted({run["rows"] for run in runs}, key=lambda rows: rows or 0):
+        fitting = [run for run in runs if run["rows"] == rows and run["errors"] == 0
+                   and run["latency_ms"].get("p95", float("inf")) <= target_ms]
+        best = max(fitting, key=lambda run: run["throughput_rps"], default=None)
+        report.append({
+            "rows": rows,
+            "target_p95_ms": target_ms,
+            "workers": best and best["workers"],
+            "users": best and best["users"],
+            "throughput_rps": best and best["throughput_rps"],
+            "rps_per_worker": best and best["throughput_rps"] / (best["workers"] or 1),
+            "worker_pss_mb": best and max((worker.get("pss_mb", 0) for worker in best["memory"]["workers"]), default=None),
+        })
+    return report
+
+
+def print_report(results):
+    scale = lambda rows: f"{rows:,}" if rows else "-"
+    print(f"{'rows':>12} {'workers':>8} {'users':>6} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7} {'worker PSS':>11}")
+    for run in results["runs"]:
+        latency = run["latency_ms"]
+        pss = max((worker.get("pss_mb", 0) for worker in run["memory"]["workers"]), default=0)
+        print(f"{scale(run['rows']):>12} {run['workers'] or '-':>8} {run['users']:>6} {run['throughput_rps']:>8.1f} "
+              f"{latency.get('p50', 0):>6.0f}ms {latency.get('p95', 0):>6.0f}ms {latency.get('p99', 0):>6.0f}ms "
+              f"{run['errors']:>7} {pss:>8.0f} MB")
+
+    print()
+    for entry in results["capacity"]:
+        if entry["workers"] is None:
+            print(f"{scale(entry['rows']):>12} rows: no configuration kept p95 under {entry['target_p95_ms']:.0f}ms")
+        else:
+            print(f"{scale(entry['rows']):>12} rows: {entry['rps_per_worker']:.1f} req/s per worker "
+                  f"(p95 <= {entry['target_p95_ms']:.0f}ms with {entry['workers']} workers, {entry['users']} users)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the dashboard through a local gunicorn instance")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--workers", type=int, nargs="+", default=DEFAULT_WORKERS)
+    parser.add_argument("--users", type=int, nargs="+", default=[16])
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds per configuration")
+    parser.add_argument("--ramp", type=float, default=5, help="Unmeasured seconds before each measurement")
+    parser.add_argument("--think", type=float, default=0.5, help="Mean pause between a user's actions")
+    parser.add_argument("--target-p95-ms", type=float, default=500)
+    parser.add_argument("--startup-timeout", type=float, default=600)
+    parser.add_argument("--url", default=None, help="Test an already running server (host:port) instead")
+    parser.add_argument("--workdir", default=os.path.join("benchmarks", "data"))
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    os.makedirs(args.workdir, exist_ok=True)
+    settings = {key: value for key, value in vars(args).items() if key not in ("output", "workdir")}
+    results = {"environment": environment(), "settings": settings, "runs": []}
+
+    if args.url:
+        host, port = args.url.rsplit(":", 1)
+        configurations = [(None, None, users) for users in args.users]
+    else:
+        configurations = [(rows, workers, users) for rows in args.rows for workers in args.workers for users in args.users]
+
+    for rows, workers, users in configurations:
+        print(f"Load testing rows={rows} workers={workers} users={users} ...", file=sys.stderr)
+        if args.url:
+            run = drive(host, int(port), users, args.duration, args.ramp, args.think)
+            run["memory"] = {"master": {}, "workers": []}
+        else:
+            with serve(rows, workers, args.workdir, args.startup_timeout) as (port, master):
+                run = drive("127.0.0.1", port, users, args.duration, args.ramp, args.think)
+                run["memory"] = server_memory(master)
+        results["runs"].append(dict({"rows": rows, "workers": workers, "users": users}, **run))
+
+    results["capacity"] = capacity(results["runs"], args.target_p95_ms)
+    print_report(results)
+
+    output_path = args.output or os.path.join(
+        "benchmarks", "results", "load-" + datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2, default=float)
+
+    print(f"Results written to {output_path}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
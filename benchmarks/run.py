@@ -0,0 +1,176 @@
+# Importing Libraries
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import resource
+import statistics
+import subprocess
+import tracemalloc
+from datetime import datetime, timezone
+
+from benchmarks.generate import generate
+
+
+DEFAULT_SCALES = [100_000, 1_000_000, 10_000_000]
+
+# Representative Inputs For Every Callback
+CALLBACKS = {
+    "pages.home.build_card": ["all", 2022, 2023],
+    "pages.home.build_line_chart": [("all", []), (2022, []), (2022, ["gender:Female", "shopping_mall:Kanyon"])],
+    "pages.home.build_pie_bar": [("all", []), (2022, []), (2022, ["gender:Female", "shopping_mall:Kanyon"])],
+    "pages.home.build_bar_charts": [("all", []), (2022, []), (2022, ["category:Books", "payment_method:Cash"])],
+    "pages.malls.build_max_min_card": [[], ["Kanyon"], ["Kanyon", "Metrocity", "Zorlu Center"]],
+    "pages.malls.build_bar_mall_gender": [[], ["Kanyon"], ["Kanyon", "Metrocity", "Zorlu Center"]],
+    "pages.malls.build_scatter_mall_category": [[], ["Kanyon"], ["Kanyon", "Metrocity", "Zorlu Center"]],
+    "pages.home.build_distributions": ["all", 2022],
+    "pages.malls.build_price_distribution": [[], ["Kanyon"], ["Kanyon", "Metrocity", "Zorlu Center"]],
+    "pages.malls.build_age_histogram": [[], ["Kanyon"], ["Kanyon", "Metrocity", "Zorlu Center"]],
+}
+
+
+# ----------- Measuring Helpers
+def max_rss_mb():
+    # Linux Reports KiB, macOS Bytes
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / 1024 / 1024 if sys.platform == "darwin" else max_rss / 1024
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def summarize(durations):
+    return {
+        "runs": len(durations),
+        "min_ms": min(durations) * 1000,
+        "median_ms": statistics.median(durations) * 1000,
+        "mean_ms": statistics.fmean(durations) * 1000,
+    }
+
+
+def traced_peak_mb(func, *args):
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+
+# ----------- One Scale (Runs In Its Own Process)
+# The dashboard keeps per-process state (data, cube, caches), so every scale
+# gets a fresh interpreter and a fresh cache directory.
+def run_scale(rows, workdir, repeat):
+    data_path = os.path.join(workdir, f"customer_shopping_data_{rows}.csv")
+    if not os.path.exists(data_path):
+        generate(data_path, rows)
+
+    cache_dir = os.path.join(workdir, f"cache_{rows}")
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.environ.update(DASHBOARD_DATA_PATH=data_path, DASHBOARD_CACHE_DIR=cache_dir,
+                      DASHBOARD_INGEST_DIR=os.path.join(workdir, f"incoming_{rows}"),
+                      DASHBOARD_INGEST_POLL_SECONDS="0")
+
+    from dashboard import cube, data, distinct
+
+    steps = {}
+
+    def step(name, func, *args):
+        duration = timed(func, *args)
+        steps[name] = {"seconds": duration, "max_rss_mb": max_rss_mb()}
+
+    # Data Load: Cold Store Build, Then Attaching To It
+    step("store_build", data.prepare_store)
+    step("attach", data.get_data)
+    step("cube_build", cube.get_cube)
+    step("distinct_build", distinct.get_counter)
+    step("import_app", __import__, "main")
+
+    callbacks = {}
+    for name, inputs in CALLBACKS.items():
+        module_name, func_name = name.rsplit(".", 1)
+        func = getattr(sys.modules[module_name], func_name)
+        # memoize Exposes The Undecorated Callback (Copied Up By instrument)
+        uncached = func.uncached
+
+        for option in inputs:
+            # Tuples Are Several Arguments (e.g. A Date Range)
+            args = option if isinstance(option, tuple) else (option,)
+            durations = [timed(uncached, *args) for _ in range(repeat)]
+
+            # Memoized Path: First Call Fills The Figure Cache
+            func(*args)
+            cached = [timed(func, *args) for _ in range(repeat)]
+
+            callbacks[f"{name}({', '.join(map(repr, args))})"] = dict(
+                summarize(durations),
+                cached_median_ms=statistics.median(cached) * 1000,
+                peak_mb=traced_peak_mb(uncached, *args),
+            )
+
+    return {"rows": rows, "steps": steps, "callbacks": callbacks, "max_rss_mb": max_rss_mb()}
+
+
+# ----------- Comparable Run Metadata
+def environment():
+    import numpy
+    import pandas
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark data loading and every page callback")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workdir", default=os.path.join("benchmarks", "data"))
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--single", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    os.makedirs(args.workdir, exist_ok=True)
+
+    if args.single:
+        json.dump(run_scale(args.rows[0], args.workdir, args.repeat), sys.stdout)
+        return
+
+    results = {"environment": environment(), "scales": []}
+    for rows in args.rows:
+        print(f"Benchmarking {rows:,} rows ...", file=sys.stderr)
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.run", "--single", "--rows", str(rows),
+             "--repeat", str(args.repeat), "--workdir", args.workdir],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        results["scales"].append(json.loads(output))
+
+    output_path = args.output or os.path.join(
+        "benchmarks", "results", datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print(f"Results written to {output_path}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Shared Data Layer For The Dashboard Pages
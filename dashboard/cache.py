@@ -0,0 +1,228 @@
+# Importing Libraries
+import os
+import pickle
+import logging
+import hashlib
+import threading
+import functools
+from collections import OrderedDict
+
+from dashboard import config, metrics
+from dashboard.data import get_generation, get_version
+
+logger = logging.getLogger(__name__)
+
+
+# ----------- In-Memory LRU
+class LRUCache:
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self.entries:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key][0]
+
+    def set(self, key, value, size):
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self.entries:
+                self.size -= self.entries.pop(key)[1]
+            self.entries[key] = (value, size)
+            self.size += size
+
+            while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.size = 0
+
+
+# ----------- Shared On-Disk Store
+# One pickle per key; writes go through a temp file + rename so concurrent
+# workers never read half a file. Loading a pickle runs code, so the
+# directory must belong to this user and be writable by nobody else. Oldest
+# files are pruned past the byte limit: the directory is only listed once
+# this process's running total passes it, or every PRUNE_EVERY writes since
+# other workers write there too.
+PRUNE_EVERY = 64
+
+
+class DiskCache:
+    def __init__(self, directory, max_bytes=512 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.size = 0
+        self.writes = 0
+        self._lock = threading.Lock()
+        self.prune()
+
+    def path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(repr(key).encode()).hexdigest() + ".pkl")
+
+    def get(self, key):
+        try:
+            with open(self.path(key), "rb") as f:
+                stored_key, value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return None
+
+        if stored_key != key:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return value
+
+    def set(self, key, payload):
+        path = self.path(key)
+        tmp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+
+        with self._lock:
+            self.size += len(payload)
+            self.writes += 1
+            due = self.size > self.max_bytes or self.writes >= PRUNE_EVERY
+        if due:
+            self.prune()
+
+    def prune(self):
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pkl"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        # Down To 90% Of The Limit, So The Next Writes Don't Prune Again Right Away
+        total = sum(size for _, size, _ in files)
+        target = self.max_bytes if total <= self.max_bytes else self.max_bytes * 0.9
+        for _, size, path in sorted(files):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+        with self._lock:
+            self.size, self.writes = total, 0
+
+
+def is_private(directory):
+    stat = os.stat(directory)
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o022
+
+
+def open_disk_cache(directory, max_bytes):
+    if not directory:
+        return None
+
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if not is_private(directory):
+        logger.warning("Figure disk cache disabled: %s must be owned by this user and not writable by others",
+                       directory)
+        return None
+    return DiskCache(directory, max_bytes)
+
+
+memory_cache = LRUCache(config.FIGURE_CACHE_ENTRIES, config.FIGURE_CACHE_BYTES)
+disk_cache = open_disk_cache(config.FIGURE_CACHE_DIR, config.FIGURE_CACHE_DISK_BYTES)
+
+
+# ----------- Callback Memoization
+# Multi-select values are order-insensitive: ["A", "B"] and ["B", "A"] map
+# to one entry and the callback always sees the sorted list.
+def normalize(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(sorted((normalize(item) for item in value), key=repr))
+    return value
+
+
+def denormalize(value):
+    if isinstance(value, tuple):
+        return [denormalize(item) for item in value]
+    return value
+
+
+# Each argument is normalized on its own; their order is kept
+def make_key(func, args):
+    return (f"{func.__module__}.{func.__qualname__}", tuple(normalize(arg) for arg in args), get_version())
+
+
+def lookup(key):
+    value = memory_cache.get(key)
+    if value is None and disk_cache is not None:
+        value = disk_cache.get(key)
+        if value is not None:
+            memory_cache.set(key, value, len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)))
+    return value
+
+
+def store(key, value):
+    payload = pickle.dumps((key, value), pickle.HIGHEST_PROTOCOL)
+    memory_cache.set(key, value, len(payload))
+    if disk_cache is not None:
+        disk_cache.set(key, payload)
+
+
+def memoize(func):
+    @functools.wraps(func)
+    def wrapper(*args):
+        generation = get_generation()
+        key = make_key(func, args)
+        value = lookup(key)
+        metrics.record_cache(func.__name__, value is not None)
+        if value is None:
+            value = func(*[denormalize(arg) for arg in key[1]])
+            # Computed While A Batch Was Applied: Might Not Match The Key's Version
+            if generation % 2 == 0 and get_generation() == generation:
+                store(key, value)
+        return value
+
+    # For Warm-Up: Compute Without The Cache, Store Under The Right Key
+    wrapper.uncached = func
+    wrapper.cache_key = lambda *args: make_key(func, args)
+    return wrapper
+
+
+def stats():
+    result = {
+        "hits": memory_cache.hits,
+        "misses": memory_cache.misses,
+        "evictions": memory_cache.evictions,
+        "entries": len(memory_cache.entries),
+        "bytes": memory_cache.size,
+    }
+    if disk_cache is not None:
+        result["disk_hits"] = disk_cache.hits
+        result["disk_misses"] = disk_cache.misses
+    return result
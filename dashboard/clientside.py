@@ -0,0 +1,79 @@
+# Importing Libraries
+from dash import callback
+
+from dashboard import config, query
+from dashboard.cube import get_cube
+
+
+# ----------- Compact Aggregates For The Browser
+# Per-year marginals of every Sales page chart (a few KB), the card totals
+# of each year option, the price & age distributions, plus the dark template, so
+# assets/sales.js can redraw the page for any year option.
+def marginal(cube, years, dimension, measure):
+    table = cube.groupby(["year", dimension], observed=True)[measure].sum().unstack(dimension, fill_value=0)
+    table = table.reindex(years, fill_value=0)
+
+    return {
+        "labels": [str(label) for label in table.columns],
+        "values": {str(year): row.tolist() for year, row in table.iterrows()},
+    }
+
+
+# Sales, quantity & distinct customers over the days of each year option
+def card_aggregates(years):
+    ranges = {str(option): query.option_range(option) for option in ["all"] + years}
+
+    return {
+        "total_price": {option: float(query.range_total("total_price", *days)) for option, days in ranges.items()},
+        "quantity": {option: int(query.range_total("quantity", *days)) for option, days in ranges.items()},
+        "customers": {option: int(query.range_customers(*days)) for option, days in ranges.items()},
+    }
+
+
+# Price percentiles per category & the age histogram of each year option,
+# read from the sketches (a few hundred numbers per option)
+PROBABILITIES = [0.05, 0.25, 0.5, 0.75, 0.95]
+
+
+def distribution_aggregates(years):
+    distributions = {}
+    for option in ["all"] + years:
+        quantiles = query.price_quantiles(PROBABILITIES, option)
+        ages = query.age_histogram(option)
+        distributions[str(option)] = {
+            "categories": quantiles.index.astype(str).tolist(),
+            "quantiles": [quantiles[probability].tolist() for probability in PROBABILITIES],
+            "ages": ages.index.tolist(),
+            "invoices": ages.tolist(),
+        }
+    return distributions
+
+
+def sales_aggregates():
+    import plotly.io as pio
+
+    cube = get_cube()
+    years = sorted(int(year) for year in cube["year"].unique())
+    totals = cube.groupby("year")["total_price"].sum().reindex(years, fill_value=0)
+
+    return {
+        "years": years,
+        "template": pio.templates["plotly_dark"].layout.to_plotly_json(),
+        "total_price": {str(year): value for year, value in totals.items()},
+        "cards": card_aggregates(years),
+        "distributions": distribution_aggregates(years),
+        "month": marginal(cube, years, "month", "total_price"),
+        "gender": marginal(cube, years, "gender", "total_price"),
+        "category": marginal(cube, years, "category", "quantity"),
+        "payment_method": marginal(cube, years, "payment_method", "count"),
+        "shopping_mall": marginal(cube, years, "shopping_mall", "total_price"),
+    }
+
+
+# ----------- Server Callbacks That Move To The Browser
+# Registers the callback normally, unless client-side mode is on; the plain
+# function stays importable either way (benchmarks, warm-up).
+def server_callback(*args, **kwargs):
+    if config.CLIENTSIDE:
+        return lambda func: func
+    return callback(*args, **kwargs)
@@ -0,0 +1,116 @@
+import os
+
+
+# ----------- Data Source & Cache Location
+# Raw export the dashboard is built from
+DATA_PATH = os.environ.get("DASHBOARD_DATA_PATH", "customer_shopping_data.csv")
+
+# Directory holding the binary columnar cache of the cleaned data
+CACHE_DIR = os.environ.get("DASHBOARD_CACHE_DIR", ".dashboard_cache")
+
+
+# ----------- Distinct Customer Counting
+# "exact" keeps sorted id hashes per year, "hll" keeps HyperLogLog sketches,
+# "auto" switches to sketches once the data has more rows than the limit
+DISTINCT_MODE = os.environ.get("DASHBOARD_DISTINCT_MODE", "auto")
+DISTINCT_EXACT_LIMIT = int(os.environ.get("DASHBOARD_DISTINCT_EXACT_LIMIT", 5_000_000))
+HLL_PRECISION = int(os.environ.get("DASHBOARD_HLL_PRECISION", 14))
+
+
+# ----------- Figure Cache
+# In-memory LRU bounds; setting a directory adds a pickle store on disk that
+# every gunicorn worker on the box reads from and writes to (created 0700; it
+# is ignored unless owned by the app's user and not writable by others)
+FIGURE_CACHE_ENTRIES = int(os.environ.get("DASHBOARD_FIGURE_CACHE_ENTRIES", 256))
+FIGURE_CACHE_BYTES = int(os.environ.get("DASHBOARD_FIGURE_CACHE_BYTES", 64 * 1024 * 1024))
+FIGURE_CACHE_DIR = os.environ.get("DASHBOARD_FIGURE_CACHE_DIR", "")
+FIGURE_CACHE_DISK_BYTES = int(os.environ.get("DASHBOARD_FIGURE_CACHE_DISK_BYTES", 512 * 1024 * 1024))
+
+
+# ----------- Incremental Ingestion
+# Drop directory of new invoice batches (raw CSV layout); every worker polls it
+INGEST_DIR = os.environ.get("DASHBOARD_INGEST_DIR", "incoming")
+INGEST_POLL_SECONDS = float(os.environ.get("DASHBOARD_INGEST_POLL_SECONDS", 5))
+# POST /api/invoices only exists when a token is set; requests must send it
+# in the X-Ingest-Token header
+INGEST_TOKEN = os.environ.get("DASHBOARD_INGEST_TOKEN", "")
+INGEST_MAX_BYTES = int(os.environ.get("DASHBOARD_INGEST_MAX_BYTES", 10 * 1024 * 1024))
+
+
+# ----------- Loading Mode
+# "memory" parses the whole CSV at once; "stream" reads it in chunks of
+# CHUNK_ROWS rows, keeps only aggregates in memory and memory maps the rows
+LOAD_MODE = os.environ.get("DASHBOARD_LOAD_MODE", "memory")
+CHUNK_ROWS = int(os.environ.get("DASHBOARD_CHUNK_ROWS", 1_000_000))
+
+
+# ----------- Instrumentation
+# Callback requests slower than this are logged with their inputs (0 disables)
+SLOW_CALLBACK_MS = float(os.environ.get("DASHBOARD_SLOW_CALLBACK_MS", 500))
+
+
+# ----------- Client-Side Filtering
+# Ship per-year aggregates to the browser once and switch years there
+# (assets/sales.js) instead of a server round-trip per dropdown change.
+# Clicking charts to cross-filter needs the server, so it is off (and its
+# controls hidden) in this mode.
+CLIENTSIDE = os.environ.get("DASHBOARD_CLIENTSIDE", "0") == "1"
+
+
+# ----------- Query Backend
+# "pandas" answers callbacks from in-process aggregates; "sqlite" (or
+# "duckdb", when installed) pushes every query down to an embedded database
+# file built in CACHE_DIR, for data larger than worker memory. DuckDB files
+# are opened read-write by one process, so run it with a single worker.
+# Whatever the backend, the Sales page chart clicks (crossfilter), the
+# price/age distributions (sketches) and the Customers page are served by
+# in-process structures built from the cube, the column store and the
+# appended batches.
+QUERY_BACKEND = os.environ.get("DASHBOARD_QUERY_BACKEND", "pandas")
+SQL_POOL_SIZE = int(os.environ.get("DASHBOARD_SQL_POOL_SIZE", 8))
+
+
+# ----------- Aggregation Engine
+# "pandas" or "arrow" (needs pyarrow): runs the cube and date-index
+# group-bys on Arrow's thread pool, across all cores and outside the GIL.
+# ARROW_THREADS caps that pool (0 keeps Arrow's default of one per core).
+AGGREGATION_ENGINE = os.environ.get("DASHBOARD_AGGREGATION_ENGINE", "pandas")
+ARROW_THREADS = int(os.environ.get("DASHBOARD_ARROW_THREADS", 0))
+
+
+# ----------- HTTP Responses
+# Dash JSON responses are gzip (or brotli, when installed) compressed above
+# COMPRESS_MIN_BYTES and cached per data version + request body
+COMPRESS_MIN_BYTES = int(os.environ.get("DASHBOARD_COMPRESS_MIN_BYTES", 1024))
+COMPRESS_LEVEL = int(os.environ.get("DASHBOARD_COMPRESS_LEVEL", 6))
+RESPONSE_CACHE_ENTRIES = int(os.environ.get("DASHBOARD_RESPONSE_CACHE_ENTRIES", 512))
+RESPONSE_CACHE_BYTES = int(os.environ.get("DASHBOARD_RESPONSE_CACHE_BYTES", 32 * 1024 * 1024))
+
+
+# ----------- Sales Timeline
+# Points per timeline figure, whatever the zoom level
+TIMELINE_MAX_POINTS = int(os.environ.get("DASHBOARD_TIMELINE_MAX_POINTS", 2000))
+
+
+# ----------- Sales Crossfilter
+# Filter states kept per process; a new click selection is derived from a
+# cached state that differs from it in one dimension
+CROSSFILTER_STATES = int(os.environ.get("DASHBOARD_CROSSFILTER_STATES", 256))
+CROSSFILTER_STATE_BYTES = int(os.environ.get("DASHBOARD_CROSSFILTER_STATE_BYTES", 64 * 1024 * 1024))
+
+
+# ----------- Distribution Sketches
+# Relative error of the price quantiles (smaller means more buckets)
+SKETCH_ACCURACY = float(os.environ.get("DASHBOARD_SKETCH_ACCURACY", 0.01))
+
+
+# ----------- Transaction Export
+# Rows per streamed piece (one CSV block or one Parquet row group)
+EXPORT_CHUNK_ROWS = int(os.environ.get("DASHBOARD_EXPORT_CHUNK_ROWS", 50_000))
+
+
+# ----------- Startup Warm-Up
+# "off", "thread" or "process": precompute every dropdown state into the
+# figure cache at app start (in the gunicorn master when preload_app is on)
+WARMUP = os.environ.get("DASHBOARD_WARMUP", "off")
+WARMUP_WORKERS = int(os.environ.get("DASHBOARD_WARMUP_WORKERS", os.cpu_count() or 1))
@@ -0,0 +1,153 @@
+# Importing Libraries
+import threading
+
+import numpy as np
+import pandas as pd
+
+from dashboard import config
+from dashboard.cache import LRUCache
+from dashboard.cube import DIMENSIONS, MEASURES, get_cube
+from dashboard.metrics import phase
+
+
+# ----------- Filter State
+# filters: {dimension: frozenset of codes}; fails: {dimension: mask of the
+# rows its filter rejects}; failing: per row, how many filters reject it;
+# groups: {dimension: measures x groups sums over the rows every *other*
+# filter accepts}. States are never modified, only derived from each other.
+class FilterState:
+    def __init__(self, filters, fails, failing, groups):
+        self.filters = filters
+        self.fails = fails
+        self.failing = failing
+        self.groups = groups
+        self.nbytes = (failing.nbytes + sum(mask.nbytes for mask in fails.values())
+                       + sum(table.nbytes for table in groups.values()))
+
+
+def state_key(filters):
+    return tuple(sorted((dimension, tuple(sorted(codes))) for dimension, codes in filters.items()))
+
+
+def without(filters, dimension):
+    return {other: codes for other, codes in filters.items() if other != dimension}
+
+
+# ----------- Crossfilter Over The Cube
+# Each cube row is one combination of the dimensions with its summed
+# measures, so filtering it gives the same totals as filtering the invoices
+# while its length only depends on how many combinations occur. Every
+# dimension is an integer code array; changing one filter only touches the
+# rows whose mask flipped and updates the other dimensions' group sums by
+# those rows alone.
+class Crossfilter:
+    def __init__(self, cube):
+        self.cube = cube
+        self.codes, self.labels, self.position = {}, {}, {}
+        for dimension in DIMENSIONS:
+            codes, labels = pd.factorize(cube[dimension], sort=True)
+            self.codes[dimension] = codes.astype(np.intp)
+            self.labels[dimension] = pd.Index(labels, name=dimension)
+            self.position[dimension] = {str(label): i for i, label in enumerate(labels)}
+
+        self.values = np.vstack([cube[measure].to_numpy(dtype=float) for measure in MEASURES])
+        self.dtypes = {measure: cube[measure].dtype for measure in MEASURES}
+
+        rows = np.arange(len(cube))
+        self.root = FilterState({}, {}, np.zeros(len(cube), dtype=np.int8),
+                                {dimension: self.group_sums(dimension, rows, 1) for dimension in DIMENSIONS})
+        self.states = LRUCache(config.CROSSFILTER_STATES, config.CROSSFILTER_STATE_BYTES)
+
+    def group_sums(self, dimension, rows, sign):
+        codes, size = self.codes[dimension][rows], len(self.labels[dimension])
+        return np.vstack([np.bincount(codes, weights=values[rows] * sign, minlength=size) for values in self.values])
+
+    # years: the year menu option; selections: clicked "dimension:value" strings
+    def filter_codes(self, years=None, selections=()):
+        chosen = {}
+        for selection in selections:
+            dimension, value = selection.split(":", 1)
+            chosen.setdefault(dimension, set()).add(value)
+        if years is not None and years != "all":
+            chosen["year"] = {str(year) for year in (years if isinstance(years, (list, tuple, set)) else [years])}
+
+        return {dimension: frozenset(self.position[dimension][value] for value in values if value in self.position[dimension])
+                for dimension, values in chosen.items()}
+
+    # Same Filters As `state` Except For One Dimension
+    def refine(self, state, dimension, codes):
+        empty = np.zeros(len(state.failing), dtype=bool)
+        old = state.fails.get(dimension, empty)
+        new = ~np.isin(self.codes[dimension], list(codes))
+        changed = np.flatnonzero(old != new)
+
+        failing = state.failing.copy()
+        failing[changed] += np.where(new[changed], 1, -1).astype(np.int8)
+        before, after = state.failing[changed], failing[changed]
+
+        groups = dict(state.groups)
+        for other in DIMENSIONS:
+            if other == dimension:
+                continue
+
+            # A Row Counts For `other` When No Filter But Its Own Rejects It
+            own = state.fails.get(other, empty)[changed]
+            delta = (after - own == 0).astype(np.int8) - (before - own == 0).astype(np.int8)
+            moved = np.flatnonzero(delta)
+            if len(moved):
+                groups[other] = groups[other] + self.group_sums(other, changed[moved], delta[moved])
+
+        fails = dict(state.fails)
+        fails[dimension] = new
+        filters = dict(state.filters)
+        filters[dimension] = codes
+        return FilterState(filters, fails, failing, groups)
+
+    def state(self, filters):
+        if not filters:
+            return self.root
+
+        key = state_key(filters)
+        state = self.states.get(key)
+        if state is None:
+            # Prefer A Cached State One Dimension Away (The Previous Click)
+            dimension = next((dimension for dimension in filters
+                              if self.states.get(state_key(without(filters, dimension))) is not None),
+                             list(filters)[-1])
+            state = self.refine(self.state(without(filters, dimension)), dimension, filters[dimension])
+            self.states.set(key, state, state.nbytes)
+        return state
+
+    # Observed groups only, like a cube roll-up
+    def series(self, state, dimension, measure):
+        table = state.groups[dimension]
+        observed = table[MEASURES.index("count")] > 0
+        values = table[MEASURES.index(measure)][observed]
+        if self.dtypes[measure].kind in "iu":
+            values = np.rint(values)
+
+        return pd.Series(values.astype(self.dtypes[measure]), index=self.labels[dimension][observed], name=measure)
+
+
+# ----------- Shared Crossfilter Per Process (Rebuilt With The Cube)
+_crossfilter = None
+_lock = threading.Lock()
+
+
+def get_crossfilter():
+    global _crossfilter
+    cube = get_cube()
+    if _crossfilter is None or _crossfilter.cube is not cube:
+        with _lock:
+            if _crossfilter is None or _crossfilter.cube is not cube:
+                _crossfilter = Crossfilter(cube)
+    return _crossfilter
+
+
+# Totals of one chart under every selection except the chart's own
+def groups(dimension, measure, years=None, selections=()):
+    crossfilter = get_crossfilter()
+    with phase("filter"):
+        state = crossfilter.state(crossfilter.filter_codes(years, selections))
+    with phase("aggregate"):
+        return crossfilter.series(state, dimension, measure)
@@ -0,0 +1,119 @@
+# Importing Libraries
+import threading
+
+import pandas as pd
+
+from dashboard.engine import aggregate
+from dashboard.metrics import phase
+from dashboard.data import get_data, iter_chunks, on_append, period_columns
+
+
+# Every Sales Page Figure Is A Roll-Up Of These Dimensions
+DIMENSIONS = ["year", "month", "gender", "category", "shopping_mall", "payment_method"]
+MEASURES = ["total_price", "quantity", "count"]
+
+
+# ----------- Build The Aggregate Cube
+# One row per observed combination of the dimensions, so its size depends on
+# the number of years/malls/categories and not on the number of transactions.
+def build_cube(df):
+    year, month = period_columns(df)
+    keys = {
+        "year": year,
+        "month": month,
+        "gender": df["gender"],
+        "category": df["category"],
+        "shopping_mall": df["shopping_mall"],
+        "payment_method": df["payment_method"],
+    }
+
+    return aggregate(keys, {
+        "total_price": (df["total_price"], "sum"),
+        "quantity": (df["quantity"], "sum"),
+        "count": (df["total_price"], "count"),
+    })
+
+
+def merge_cubes(*cubes):
+    cube = pd.concat(cubes, ignore_index=True)
+    return aggregate({dimension: cube[dimension] for dimension in DIMENSIONS},
+                     {measure: (cube[measure], "sum") for measure in MEASURES})
+
+
+# Fold Chunk Cubes One By One, So Only Summaries Are Ever Held
+def build_cube_from(chunks):
+    cube = None
+    for chunk in chunks:
+        chunk_cube = build_cube(chunk)
+        cube = chunk_cube if cube is None else merge_cubes(cube, chunk_cube)
+    return cube if cube is not None else build_cube(get_data().iloc[:0])
+
+
+# ----------- Query The Cube
+# years: "all", one year or a list of years; malls: None/[] for every mall
+def select(cube, years=None, malls=None):
+    with phase("filter"):
+        return select_rows(cube, years, malls)
+
+
+def select_rows(cube, years, malls):
+    if years is not None and years != "all":
+        if not isinstance(years, (list, tuple, set)):
+            years = [years]
+        cube = cube[cube["year"].isin(years)]
+
+    if malls:
+        cube = cube[cube["shopping_mall"].isin(malls)]
+
+    return cube
+
+
+def total(measure, years=None, malls=None):
+    cube = select(get_cube(), years, malls)
+    with phase("aggregate"):
+        return cube[measure].sum()
+
+
+def rollup(dimension, measure, years=None, malls=None):
+    cube = select(get_cube(), years, malls)
+    dimensions = dimension if isinstance(dimension, list) else [dimension]
+    with phase("aggregate"):
+        table = aggregate({key: cube[key] for key in dimensions}, {measure: (cube[measure], "sum")})
+        return table.set_index(dimension)[measure]
+
+
+# ----------- Shared Cube Per Process
+_cube = None
+_lock = threading.Lock()
+
+
+def get_cube():
+    global _cube
+    if _cube is None:
+        with _lock:
+            if _cube is None:
+                _cube = build_cube_from(iter_chunks())
+    return _cube
+
+
+# Call After The Underlying Data Changed
+def rebuild_cube(df=None):
+    global _cube
+    cube = build_cube_from(iter_chunks(df))
+    with _lock:
+        _cube = cube
+    return cube
+
+
+# Fold Appended Invoices Into The Existing Cube
+@on_append
+def update_cube(batch, batch_id):
+    if _cube is None:
+        return None
+    cube = merge_cubes(_cube, build_cube(batch))
+
+    def commit():
+        global _cube
+        with _lock:
+            _cube = cube
+    return commit
@@ -0,0 +1,182 @@
+# Importing Libraries
+import threading
+
+import numpy as np
+import pandas as pd
+
+from dashboard.engine import aggregate
+from dashboard.metrics import phase
+from dashboard.data import get_data, iter_chunks, on_append
+
+
+SEGMENTS = ["Champions", "Loyal", "Promising", "Need Attention", "At Risk", "Hibernating"]
+
+AGE_BINS = [0, 25, 35, 45, 55, 65, 200]
+AGE_BANDS = ["Under 25", "25-34", "35-44", "45-54", "55-64", "65+"]
+
+
+# ----------- Per-Customer Summary
+# One row per customer: first/last purchase day, number of purchases, money
+# spent, and the age & gender of their latest invoice. Built with a single
+# groupby per chunk and merged by customer id.
+def summarize(df):
+    frame = pd.DataFrame({
+        "customer_id": df["customer_id"].astype(str).array,
+        "day": df["invoice_date"].to_numpy().astype("datetime64[D]"),
+        "total_price": df["total_price"].to_numpy(),
+        "age": df["age"].to_numpy(),
+        "gender": df["gender"].astype(str).array,
+    }, copy=False)
+
+    return frame.groupby("customer_id", sort=False).agg(
+        first_day=("day", "min"),
+        last_day=("day", "max"),
+        frequency=("day", "size"),
+        monetary=("total_price", "sum"),
+        age=("age", "last"),
+        gender=("gender", "last"),
+    )
+
+
+# Only the customers in `update` are touched; new customers are appended.
+def merge_summaries(summary, update):
+    common = update.index.intersection(summary.index)
+    merged = summary.copy()
+
+    if len(common):
+        old, new = summary.loc[common], update.loc[common]
+        merged.loc[common, "first_day"] = np.minimum(old["first_day"], new["first_day"])
+        merged.loc[common, "frequency"] = old["frequency"] + new["frequency"]
+        merged.loc[common, "monetary"] = old["monetary"] + new["monetary"]
+
+        # Latest Invoice Wins For Age & Gender
+        newer = new["last_day"] >= old["last_day"]
+        for column in ["last_day", "age", "gender"]:
+            merged.loc[common, column] = new[column].where(newer, old[column])
+
+    return pd.concat([merged, update.loc[update.index.difference(summary.index)]])
+
+
+def build_summary_from(chunks):
+    summary = None
+    for chunk in chunks:
+        chunk_summary = summarize(chunk)
+        summary = chunk_summary if summary is None else merge_summaries(summary, chunk_summary)
+    return summary if summary is not None else summarize(get_data().iloc[:0])
+
+
+# ----------- RFM Scores & Segments
+# Quintile scores 1-5 from the share of customers with a strictly lower
+# value, so equal values always get equal scores whatever the row order;
+# recency in days before the latest invoice in the data.
+def quintile(values):
+    below = values.rank(method="min").to_numpy() - 1
+    return np.clip(np.floor(below * 5 / max(len(below), 1)) + 1, 1, 5).astype(np.int8)
+
+
+def score(summary):
+    recency = (summary["last_day"].max() - summary["last_day"]).dt.days
+    r = 6 - quintile(recency)
+    f = quintile(summary["frequency"])
+    m = quintile(summary["monetary"])
+
+    segment = np.select(
+        [(r >= 4) & (f >= 4), (r >= 3) & (f >= 3), (r >= 4) & (f <= 2), (r <= 2) & (f >= 3), (r <= 2) & (f <= 2)],
+        ["Champions", "Loyal", "Promising", "At Risk", "Hibernating"],
+        default="Need Attention",
+    )
+    return summary.assign(recency=recency, r=r, f=f, m=m, segment=pd.Categorical(segment, SEGMENTS))
+
+
+# ----------- Customer Cube
+# Customers grouped by the page's filters and chart dimensions, so every
+# chart is a roll-up of a table with at most a few thousand rows.
+DIMENSIONS = ["gender", "age", "segment", "frequency"]
+MEASURES = ["customers", "purchases", "monetary", "recency"]
+
+
+def build_customer_cube(scored):
+    return aggregate(
+        {"gender": scored["gender"].astype("category"), "age": scored["age"],
+         "segment": scored["segment"], "frequency": scored["frequency"]},
+        {"customers": (scored["frequency"], "count"), "purchases": (scored["frequency"], "sum"),
+         "monetary": (scored["monetary"], "sum"), "recency": (scored["recency"], "sum")},
+    )
+
+
+# gender: "all" or one gender; ages: None or [lowest, highest]
+def select(gender="all", ages=None):
+    cube = get_customer_cube()
+    with phase("filter"):
+        if gender and gender != "all":
+            cube = cube[cube["gender"] == gender]
+        if ages:
+            cube = cube[cube["age"].between(ages[0], ages[1])]
+        return cube
+
+
+def totals(gender="all", ages=None):
+    cube = select(gender, ages)
+    with phase("aggregate"):
+        return cube[MEASURES].sum()
+
+
+def rollup(dimension, measure, gender="all", ages=None):
+    cube = select(gender, ages)
+    dimensions = dimension if isinstance(dimension, list) else [dimension]
+    with phase("aggregate"):
+        if "age_band" in dimensions:
+            cube = cube.assign(age_band=pd.cut(cube["age"], AGE_BINS, right=False, labels=AGE_BANDS))
+        return cube.groupby(dimension, observed=True)[measure].sum()
+
+
+def age_bounds():
+    ages = get_customer_cube()["age"]
+    return int(ages.min()), int(ages.max())
+
+
+# ----------- Shared Tables Per Process
+_summary = None
+_customer_cube = None
+_lock = threading.Lock()
+
+
+def publish(summary):
+    global _summary, _customer_cube
+    customer_cube = build_customer_cube(score(summary))
+    _summary, _customer_cube = summary, customer_cube
+
+
+def get_summary():
+    if _summary is None:
+        with _lock:
+            if _summary is None:
+                publish(build_summary_from(iter_chunks()))
+    return _summary
+
+
+def get_customer_cube():
+    get_summary()
+    return _customer_cube
+
+
+# Call After The Underlying Data Changed
+def rebuild_customers(df=None):
+    with _lock:
+        publish(build_summary_from(iter_chunks(df)))
+    return _summary
+
+
+# Merge The Customers Of Appended Invoices Into The Summary
+@on_append
+def update_customers(batch, batch_id):
+    if _summary is None:
+        return None
+    summary = merge_summaries(_summary, summarize(batch))
+    customer_cube = build_customer_cube(score(summary))
+
+    def commit():
+        global _summary, _customer_cube
+        with _lock:
+            _summary, _customer_cube = summary, customer_cube
+    return commit
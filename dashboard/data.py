@@ -0,0 +1,255 @@
+# Importing Libraries
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from dashboard import config
+from dashboard.store import (CATEGORICAL_COLUMNS, COLUMNS, cache_path, file_hash, is_fresh,
+                             read_meta, read_store, source_stat, write_store)
+
+
+# ----------- Data Cleaning & Casting
+def clean_data(df):
+    # Casting Data Type of Date
+    df["invoice_date"] = pd.to_datetime(df["invoice_date"], format="%d/%m/%Y")
+
+    # Add Another Column of Total Sales In Lira
+    df["total_price"] = df["quantity"] * df["price"]
+
+    # Drop Unnecessary Column
+    df = df.drop(columns="invoice_no")
+
+    # Compact Text Columns
+    for column in CATEGORICAL_COLUMNS:
+        df[column] = df[column].astype("category")
+
+    # Rearange The Order Of Columns
+    df = df[COLUMNS]
+
+    # Sort By Date So Every Year/Month Is One Contiguous Block Of Rows
+    return df.sort_values("invoice_date", kind="stable", ignore_index=True)
+
+
+# Streaming Mode: Parse & Clean The CSV A Chunk At A Time
+def iter_csv(path, chunk_rows):
+    for chunk in pd.read_csv(path, chunksize=chunk_rows):
+        yield clean_data(chunk)
+
+
+# ----------- Build The Column Store
+# "memory" parses the whole CSV at once; "stream" never holds more than one
+# chunk of parsed rows. Either way the result is the on-disk store, and it is
+# only rebuilt when the source changed. Called from the gunicorn master this
+# builds the store once before any worker forks.
+def prepare_store(path=None):
+    path = path or config.DATA_PATH
+    directory = cache_path(path)
+
+    meta = read_meta(directory)
+    if is_fresh(meta, path):
+        return meta
+
+    source = source_stat(path)
+    source["hash"] = file_hash(path)
+
+    if config.LOAD_MODE == "stream":
+        chunks = iter_csv(path, config.CHUNK_ROWS)
+    else:
+        chunks = [clean_data(pd.read_csv(path))]
+
+    return write_store(chunks, directory, source)
+
+
+# ----------- Load Data
+# Workers attach to the store instead of holding their own copy: every column
+# is memory mapped read-only, so all processes on the box share the same
+# pages (point DASHBOARD_CACHE_DIR at /dev/shm to keep them in RAM).
+def load_data(path=None):
+    path = path or config.DATA_PATH
+
+    try:
+        meta = prepare_store(path)
+    except OSError:
+        # Read-Only Deployments Still Work, Just Without The Store
+        df = clean_data(pd.read_csv(path))
+        df.attrs["version"] = file_hash(path)
+        return df
+
+    df = read_store(cache_path(path), meta)
+    df.attrs["version"] = meta["source"]["hash"]
+    return df
+
+
+# ----------- Year/Month Partition Index
+# Rows are sorted by invoice_date, so each month is a [start, stop) range of
+# row offsets; years are the union of their months' ranges.
+def build_partitions(df):
+    months = df["invoice_date"].to_numpy().astype("datetime64[M]")
+    if len(months) == 0:
+        return {"years": {}, "months": {}}
+
+    starts = np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+    stops = np.r_[starts[1:], len(months)]
+
+    partitions = {"years": {}, "months": {}}
+    for start, stop in zip(starts.tolist(), stops.tolist()):
+        month = months[start].astype(object)
+        partitions["months"][(month.year, month.month)] = (start, stop)
+
+        year_start, _ = partitions["years"].get(month.year, (start, stop))
+        partitions["years"][month.year] = (year_start, stop)
+
+    # A Month Split Into Several Runs Means The Rows Are Not Sorted
+    if len(partitions["months"]) != len(starts):
+        raise ValueError("Rows must be sorted by invoice_date")
+    return partitions
+
+
+# Year & Month Of Every Row, Expanded From The Index Instead Of .dt Accessors
+def period_columns(df, partitions=None):
+    partitions = partitions or build_partitions(df)
+    keys = list(partitions["months"])
+    lengths = [stop - start for start, stop in partitions["months"].values()]
+
+    year = np.repeat(np.array([year for year, _ in keys], dtype=np.int32), lengths)
+    month = np.repeat(np.array([month for _, month in keys], dtype=np.int8), lengths)
+    return year, month
+
+
+# One Copy Per Process, Shared By All Pages
+_df = None
+_version = None
+_batch_ids = ()
+_batches = []
+_lock = threading.Lock()
+
+
+def get_data():
+    global _df, _version
+    if _df is None:
+        with _lock:
+            if _df is None:
+                _df = load_data()
+                _version = _df.attrs["version"]
+    return _df
+
+
+# Identifies The Loaded Data (Content Hash Of The Source + Applied Batches)
+def get_version():
+    get_data()
+    return _version
+
+
+# ----------- Chunked Access
+# Row slices of at most chunk_rows rows (zero-copy on the sorted data),
+# followed by the appended batches. Aggregates are built
+# from these so no full-size temporary is ever allocated.
+def iter_chunks(df=None, chunk_rows=None):
+    chunk_rows = chunk_rows or config.CHUNK_ROWS
+    if df is None:
+        df, batches = get_data(), list(_batches)
+    else:
+        batches = []
+
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+    yield from batches
+
+
+# Rows With start <= invoice_date < stop: a binary-searched zero-copy slice of
+# the sorted data (in pieces of chunk_rows, if given), followed by the
+# matching rows of the appended batches.
+def iter_range(start, stop, df=None, chunk_rows=None):
+    if df is None:
+        df, batches = get_data(), list(_batches)
+    else:
+        batches = []
+
+    dates = df["invoice_date"].to_numpy()
+    first, last = np.searchsorted(dates, start, "left"), np.searchsorted(dates, stop, "left")
+    step = chunk_rows or max(last - first, 1)
+    for offset in range(first, max(last, first + 1), step):
+        yield df.iloc[offset:min(offset + step, last)]
+    for batch in batches:
+        yield batch[(batch["invoice_date"] >= start) & (batch["invoice_date"] < stop)]
+
+
+# ----------- Appending New Invoices
+# Listeners are called with each batch and its id (unique per batch, even
+# when two batches hold the same rows) and return a function that commits
+# their new state, or None. Every listener builds its state before any of
+# them commits, so a batch that fails anywhere changes nothing; the commits
+# run before the new data version is published, so derived aggregates never
+# lag behind the version. The generation is odd while a batch is being
+# applied: a result computed across a change of generation may mix old and
+# new data and must not be cached.
+_listeners = []
+_generation = 0
+_append_lock = threading.Lock()
+
+
+def get_generation():
+    return _generation
+
+
+def on_append(listener):
+    _listeners.append(listener)
+    return listener
+
+
+# Small batches are merged (at most CHUNK_ROWS rows each), so replaying many
+# tiny files does not turn every chunked pass into thousands of pieces. A
+# backfill can be older than the batch before it, so the merged rows are
+# sorted by date again like every other chunk.
+def concat_batches(first, second):
+    columns = {}
+    for column in COLUMNS:
+        if column in CATEGORICAL_COLUMNS:
+            columns[column] = union_categoricals([first[column], second[column]])
+        else:
+            columns[column] = np.concatenate([first[column].to_numpy(), second[column].to_numpy()])
+
+    merged = pd.DataFrame(columns)
+    if second["invoice_date"].iloc[0] < first["invoice_date"].iloc[-1]:
+        merged = merged.sort_values("invoice_date", kind="stable", ignore_index=True)
+    return merged
+
+
+# The version only depends on the base data and the set of applied batches,
+# so workers that applied the same batches in another order agree on it.
+def batch_version(base_version, batches):
+    digest = hashlib.blake2b(base_version.encode(), digest_size=16)
+    for batch_id in sorted(batches):
+        digest.update(b"\0" + batch_id.encode())
+    return digest.hexdigest()
+
+
+# The memory-mapped store stays as built in both loading modes; the batch is
+# kept aside for iter_chunks()/iter_range(), so workers never copy the table.
+def append_data(batch, batch_id):
+    global _version, _batch_ids, _batches, _generation
+    get_data()
+
+    with _append_lock:
+        _generation += 1
+        try:
+            commits = [listener(batch, batch_id) for listener in _listeners]
+
+            batch_ids = _batch_ids + (batch_id,)
+            if _batches and len(_batches[-1]) + len(batch) <= config.CHUNK_ROWS:
+                batches = _batches[:-1] + [concat_batches(_batches[-1], batch)]
+            else:
+                batches = _batches + [batch]
+
+            for commit in commits:
+                if commit is not None:
+                    commit()
+
+            with _lock:
+                _batches, _batch_ids = batches, batch_ids
+                _version = batch_version(_df.attrs["version"], batch_ids)
+        finally:
+            _generation += 1
@@ -0,0 +1,152 @@
+# Importing Libraries
+import threading
+
+import numpy as np
+import pandas as pd
+
+from dashboard import distinct
+from dashboard.engine import aggregate
+from dashboard.metrics import phase
+from dashboard.data import iter_chunks, iter_range, on_append
+
+
+MEASURES = ["total_price", "quantity", "count"]
+
+
+# ----------- Daily Totals
+# One row per calendar day, so the index size depends on the date span and
+# not on the number of transactions.
+def daily_totals(df):
+    days = df["invoice_date"].to_numpy().astype("datetime64[D]")
+    return aggregate({"day": days}, {
+        "total_price": (df["total_price"], "sum"),
+        "quantity": (df["quantity"], "sum"),
+        "count": (df["total_price"], "count"),
+    }).set_index("day")
+
+
+def merge_daily(*frames):
+    return pd.concat(frames).groupby(level="day")[MEASURES].sum().sort_index()
+
+
+# ----------- Sorted Date Index With Prefix Sums
+# prefix[measure][i] is the sum over the first i days, so the total of any
+# day range is prefix[stop] - prefix[start] after two binary searches.
+class DateIndex:
+    def __init__(self, daily):
+        self.daily = daily
+        self.days = daily.index.to_numpy().astype("datetime64[D]")
+        self.prefix = {
+            measure: np.concatenate([[0], np.cumsum(daily[measure].to_numpy())])
+            for measure in MEASURES
+        }
+
+    def bounds(self):
+        if len(self.days) == 0:
+            return None, None
+        return self.days[0], self.days[-1]
+
+    def years(self):
+        return sorted(set((self.days.astype("datetime64[Y]").astype(int) + 1970).tolist()))
+
+    # start/end are inclusive days; None means unbounded
+    def span(self, start=None, end=None):
+        first = 0 if start is None else np.searchsorted(self.days, start, "left")
+        last = len(self.days) if end is None else np.searchsorted(self.days, end, "right")
+        return first, max(first, last)
+
+    def total(self, measure, start=None, end=None):
+        first, last = self.span(start, end)
+        return self.prefix[measure][last] - self.prefix[measure][first]
+
+
+def build_index_from(chunks):
+    frames = [daily_totals(chunk) for chunk in chunks]
+    daily = merge_daily(*frames) if frames else pd.DataFrame(columns=MEASURES, index=pd.Index([], name="day"))
+    return DateIndex(daily)
+
+
+# ----------- Parsing Day Values
+# "YYYY-MM-DD", sometimes with a time part
+def parse_day(value):
+    if value is None or value == "":
+        return None
+    return np.datetime64(str(value)[:10], "D")
+
+
+def year_of(day):
+    return int(day.astype("datetime64[Y]").astype(int)) + 1970
+
+
+def year_range(year):
+    return np.datetime64(f"{year}-01-01", "D"), np.datetime64(f"{year}-12-31", "D")
+
+
+# ----------- Query The Index
+def total(measure, start=None, end=None):
+    index = get_index()
+    with phase("aggregate"):
+        return index.total(measure, parse_day(start), parse_day(end))
+
+
+# Whole years reuse the per-year distinct counter; any other range counts
+# the customers of the binary-searched row slice.
+def count_customers(start=None, end=None):
+    index = get_index()
+    start, end = parse_day(start), parse_day(end)
+    first_day, last_day = index.bounds()
+    if first_day is None:
+        return 0
+
+    start = max(start, first_day) if start is not None else first_day
+    end = min(end, last_day) if end is not None else last_day
+    if start > end:
+        return 0
+
+    first_year, last_year = year_of(start), year_of(end)
+    if start == max(year_range(first_year)[0], first_day) and end == min(year_range(last_year)[1], last_day):
+        years = list(range(first_year, last_year + 1))
+        return distinct.count_customers(None if years == index.years() else years)
+
+    with phase("filter"):
+        chunks = list(iter_range(start, end + np.timedelta64(1, "D")))
+    with phase("aggregate"):
+        hashes = [distinct.customer_hashes(chunk["customer_id"]) for chunk in chunks if len(chunk)]
+        return len(np.unique(np.concatenate(hashes))) if hashes else 0
+
+
+# ----------- Shared Index Per Process
+_index = None
+_lock = threading.Lock()
+
+
+def get_index():
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                _index = build_index_from(iter_chunks())
+    return _index
+
+
+# Call After The Underlying Data Changed
+def rebuild_index(df=None):
+    global _index
+    index = build_index_from(iter_chunks(df))
+    with _lock:
+        _index = index
+    return index
+
+
+# Fold Appended Invoices Into The Existing Index
+@on_append
+def update_index(batch, batch_id):
+    if _index is None:
+        return None
+    index = DateIndex(merge_daily(_index.daily, daily_totals(batch)))
+
+    def commit():
+        global _index
+        with _lock:
+            _index = index
+    return commit
@@ -0,0 +1,83 @@
+# Importing Libraries
+import logging
+
+import numpy as np
+import pandas as pd
+
+from dashboard import config
+
+logger = logging.getLogger(__name__)
+
+
+# ----------- Group-By Engines
+# aggregate(keys, values) -> DataFrame with one row per observed key
+# combination, sorted by the keys (categories in category order), with the
+# key columns first. keys: {name: column}; values: {name: (column, "sum" | "count")}.
+# Both engines return the same frame, column dtypes included.
+def pandas_aggregate(keys, values):
+    frame = pd.DataFrame({name: as_array(column) for name, column in keys.items()}, copy=False)
+    for name, (column, _) in values.items():
+        frame[name] = as_array(column)
+
+    aggregations = {name: (name, "sum" if how == "sum" else "size") for name, (_, how) in values.items()}
+    return frame.groupby(list(keys), observed=True).agg(**aggregations).reset_index()
+
+
+# Categorical keys are grouped by their integer codes, so Arrow never sees
+# strings; group-by/sum/count run on Arrow's thread pool without the GIL.
+def arrow_aggregate(keys, values):
+    import pyarrow as pa
+
+    columns, categories = {}, {}
+    for name, column in keys.items():
+        array = as_array(column)
+        if isinstance(array, pd.Categorical):
+            categories[name] = (array.categories, array.ordered)
+            array = array.codes
+        columns[name] = pa.array(np.asarray(array))
+    for name, (column, _) in values.items():
+        columns[name] = pa.array(np.asarray(as_array(column)))
+
+    table = pa.table(columns).group_by(list(keys), use_threads=True).aggregate(
+        [(name, "sum" if how == "sum" else "count") for name, (_, how) in values.items()])
+
+    result = pd.DataFrame({name: table.column(name).to_numpy() for name in keys})
+    for name, (_, how) in values.items():
+        result[name] = table.column(f"{name}_{'sum' if how == 'sum' else 'count'}").to_numpy()
+
+    # Missing Category Codes Are -1; pandas Drops Those Groups
+    for name, (names, ordered) in categories.items():
+        result = result[result[name] >= 0]
+    result = result.sort_values(list(keys), kind="stable", ignore_index=True)
+    for name, (names, ordered) in categories.items():
+        result[name] = pd.Categorical.from_codes(result[name], names, ordered=ordered)
+
+    return result
+
+
+def as_array(column):
+    return column.array if isinstance(column, pd.Series) else column
+
+
+ENGINES = {"pandas": pandas_aggregate, "arrow": arrow_aggregate}
+
+
+# ----------- Engine Picked Once At Startup
+_engine = None
+
+
+def get_engine():
+    global _engine
+    if _engine is None:
+        name = config.AGGREGATION_ENGINE
+        if name == "arrow":
+            import pyarrow as pa
+            if config.ARROW_THREADS:
+                pa.set_cpu_count(config.ARROW_THREADS)
+            logger.info("Aggregating with Arrow on %d threads", pa.cpu_count())
+        _engine = ENGINES[name]
+    return _engine
+
+
+def aggregate(keys, values):
+    return get_engine()(keys, values)
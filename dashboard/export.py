@@ -0,0 +1,134 @@
+# Importing Libraries
+import io
+import urllib.parse
+import importlib.util
+
+import numpy as np
+from flask import Response, jsonify, request
+
+from dashboard import config
+from dashboard.data import get_data, iter_chunks, iter_range
+
+# Filters Besides year & month (Repeat A Parameter For Several Values)
+FILTER_COLUMNS = ["gender", "category", "shopping_mall", "payment_method"]
+
+FORMATS = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+# Parquet Needs pyarrow, Which Is Optional
+PARQUET = importlib.util.find_spec("pyarrow") is not None
+
+
+# ----------- Filtered Rows, One Chunk At A Time
+# Whole years are binary-searched slices of the date-sorted data; the other
+# filters are applied chunk by chunk, so at most one chunk is ever copied.
+def iter_rows(years=None, months=None, filters=None, chunk_rows=None):
+    chunk_rows = chunk_rows or config.EXPORT_CHUNK_ROWS
+    if years:
+        chunks = (chunk for year in sorted(set(years))
+                  for chunk in iter_range(np.datetime64(f"{year}-01-01"), np.datetime64(f"{year + 1}-01-01"),
+                                          chunk_rows=chunk_rows))
+    else:
+        chunks = iter_chunks(chunk_rows=chunk_rows)
+
+    for chunk in chunks:
+        mask = np.ones(len(chunk), dtype=bool)
+        if months:
+            mask &= np.isin(chunk["invoice_date"].dt.month.to_numpy(), months)
+        for column, values in (filters or {}).items():
+            mask &= chunk[column].isin(values).to_numpy()
+
+        if mask.all():
+            yield chunk
+        elif mask.any():
+            yield chunk[mask]
+
+
+# ----------- Encoders (Generators Of Bytes)
+def csv_stream(chunks):
+    header = True
+    for chunk in chunks:
+        yield chunk.to_csv(index=False, header=header, date_format="%Y-%m-%d").encode()
+        header = False
+
+    if header:
+        yield get_data().iloc[:0].to_csv(index=False).encode()
+
+
+# Collects what the Parquet writer wrote since the last drain()
+class StreamSink(io.RawIOBase):
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data, self.parts = b"".join(self.parts), []
+        return data
+
+
+# One row group per chunk; categorical columns are written as plain strings
+# so chunks with different category sets share one schema.
+def parquet_stream(chunks):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    empty = pa.Table.from_pandas(get_data().iloc[:0], preserve_index=False)
+    schema = pa.schema([pa.field(field.name, field.type.value_type if pa.types.is_dictionary(field.type) else field.type)
+                        for field in empty.schema])
+
+    sink = StreamSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pandas(chunk, preserve_index=False).cast(schema))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+# ----------- Route
+# /export/transactions.csv?year=2022&shopping_mall=Kanyon&shopping_mall=Metrocity
+def export_transactions(extension):
+    if extension not in FORMATS:
+        return jsonify(error=f"Unknown format {extension!r}"), 404
+    if extension == "parquet" and not PARQUET:
+        return jsonify(error="Parquet export needs pyarrow"), 501
+
+    try:
+        years = [int(year) for year in request.args.getlist("year")]
+        months = [int(month) for month in request.args.getlist("month")]
+    except ValueError:
+        return jsonify(error="year and month must be numbers"), 400
+    filters = {column: request.args.getlist(column) for column in FILTER_COLUMNS if request.args.getlist(column)}
+
+    chunks = iter_rows(years, months, filters)
+    body = csv_stream(chunks) if extension == "csv" else parquet_stream(chunks)
+    filename = "-".join(["transactions"] + [str(year) for year in sorted(set(years))]) + f".{extension}"
+
+    return Response(body, mimetype=FORMATS[extension],
+                    headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+
+# Link to the export of the given filters (lists of values)
+def export_url(extension, years=None, **filters):
+    params = [("year", year) for year in years or []]
+    params += [(column, value) for column, values in filters.items() for value in values]
+    query = urllib.parse.urlencode(params)
+    return f"/export/transactions.{extension}" + (f"?{query}" if query else "")
+
+
+def init_app(server):
+    server.add_url_rule("/export/transactions.<extension>", "export_transactions", export_transactions)
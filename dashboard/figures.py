@@ -0,0 +1,56 @@
+# Importing Libraries
+import threading
+
+
+# ----------- Prebuilt Figure Templates
+# plotly.express validates, groups and restyles every figure it builds, which
+# costs more than the aggregation behind most charts. Instead every chart id
+# gets one graph_objects figure, validated once and kept as its plain JSON
+# dict; a callback copies it and drops in the new arrays, so building (and
+# serializing) a figure only depends on the number of points it shows.
+_specs = {}
+_templates = {}
+_lock = threading.Lock()
+
+
+# trace: style shared by the chart's traces; layout: titles, bar mode, ...
+def define(chart_id, trace, layout=None):
+    with _lock:
+        _specs[chart_id] = (trace, layout or {})
+        _templates.pop(chart_id, None)
+
+
+def get_template(chart_id):
+    template = _templates.get(chart_id)
+    if template is None:
+        import plotly.graph_objects as go
+
+        with _lock:
+            trace, layout = _specs[chart_id]
+            fig = go.Figure(data=[trace], layout={"template": "plotly_dark", **layout}).to_plotly_json()
+            template = _templates[chart_id] = (fig["data"][0], fig["layout"])
+    return template
+
+
+# One level deep, so {"xaxis": {"range": ...}} keeps the template's axis title
+def merge(base, changes):
+    merged = dict(base)
+    for key, value in changes.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            value = {**base[key], **value}
+        merged[key] = value
+    return merged
+
+
+# traces: one dict per trace with its arrays (x, y, labels, marker, ...)
+def figure(chart_id, traces, title=None, **layout):
+    trace, base = get_template(chart_id)
+    if title is not None:
+        layout["title"] = {"text": title}
+
+    return {"data": [merge(trace, changes) for changes in traces], "layout": merge(base, layout)}
+
+
+# One color per bar, repeating the palette like plotly.express does per trace
+def cycle(colors, count):
+    return [colors[i % len(colors)] for i in range(count)]
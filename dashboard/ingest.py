@@ -0,0 +1,159 @@
+# Importing Libraries
+import io
+import os
+import hmac
+import time
+import uuid
+import logging
+import threading
+
+import pandas as pd
+from flask import jsonify, request
+
+from dashboard import config
+from dashboard.data import append_data, clean_data, get_version
+
+logger = logging.getLogger(__name__)
+
+
+# Columns Of The Raw Export (Same Layout As customer_shopping_data.csv)
+RAW_COLUMNS = ["invoice_no", "customer_id", "gender", "age", "category",
+               "quantity", "price", "payment_method", "invoice_date", "shopping_mall"]
+
+NUMERIC_COLUMNS = ["age", "quantity", "price"]
+TEXT_COLUMNS = [column for column in RAW_COLUMNS if column not in NUMERIC_COLUMNS]
+
+
+# ----------- Validate & Cast A Batch
+def read_batch(payload, mimetype):
+    if mimetype == "application/json":
+        return pd.read_json(io.BytesIO(payload), orient="records", dtype=False)
+    return pd.read_csv(io.BytesIO(payload), dtype=str)
+
+
+def validate_batch(raw):
+    missing = [column for column in RAW_COLUMNS if column not in raw.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    if raw.empty:
+        raise ValueError("Batch has no rows")
+
+    raw = raw[RAW_COLUMNS].copy()
+
+    empty = raw.columns[raw.isna().any()].tolist()
+    if empty:
+        raise ValueError(f"Missing values in columns: {', '.join(empty)}")
+
+    for column in NUMERIC_COLUMNS:
+        values = pd.to_numeric(raw[column], errors="coerce")
+        if values.isna().any() or (values < 0).any():
+            raise ValueError(f"Column {column} must hold non-negative numbers")
+        raw[column] = values
+
+    dates = pd.to_datetime(raw["invoice_date"].astype(str), format="%d/%m/%Y", errors="coerce")
+    if dates.isna().any():
+        raise ValueError("invoice_date must be formatted as dd/mm/yyyy")
+
+    # Ids Like 12345 Stay Text, As In The Cleaned Data
+    for column in TEXT_COLUMNS:
+        raw[column] = raw[column].astype(str)
+    return raw
+
+
+# ----------- Drop Directory
+# Every batch becomes one CSV file in the drop directory; file names sort by
+# arrival time and double as batch ids, so each worker applies each batch once.
+_applied = set()
+_sync_lock = threading.Lock()
+
+
+def save_batch(raw):
+    os.makedirs(config.INGEST_DIR, exist_ok=True)
+    name = f"{time.time_ns()}-{uuid.uuid4().hex[:8]}.csv"
+    tmp_path = os.path.join(config.INGEST_DIR, f".{name}.tmp")
+    raw.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, os.path.join(config.INGEST_DIR, name))
+    return name
+
+
+# A batch is tried once: if it fails, no aggregate has taken it in, and
+# retrying it on every poll would only log the same error again.
+def apply_batch(raw, batch_id):
+    with _sync_lock:
+        if batch_id in _applied:
+            return
+        _applied.add(batch_id)
+        append_data(clean_data(validate_batch(raw)), batch_id)
+
+
+def sync():
+    if not os.path.isdir(config.INGEST_DIR):
+        return
+
+    for name in sorted(os.listdir(config.INGEST_DIR)):
+        if not name.endswith(".csv") or name in _applied:
+            continue
+        try:
+            apply_batch(pd.read_csv(os.path.join(config.INGEST_DIR, name), dtype=str), name)
+        except (OSError, ValueError) as error:
+            logger.warning("Skipping invoice batch %s: %s", name, error)
+            _applied.add(name)
+        except Exception:
+            logger.exception("Skipping invoice batch %s", name)
+            _applied.add(name)
+
+
+# ----------- Background Polling (One Thread Per Worker Process)
+_watcher_pid = None
+
+
+def watch():
+    while True:
+        time.sleep(config.INGEST_POLL_SECONDS)
+        try:
+            sync()
+        except Exception:
+            logger.exception("Polling the invoice drop directory failed")
+
+
+def start_watcher():
+    global _watcher_pid
+    if _watcher_pid != os.getpid() and config.INGEST_POLL_SECONDS > 0:
+        _watcher_pid = os.getpid()
+        threading.Thread(target=watch, name="invoice-watcher", daemon=True).start()
+
+
+# ----------- HTTP Endpoint
+def receive_invoices():
+    token = request.headers.get("X-Ingest-Token", "")
+    if not hmac.compare_digest(token.encode(), config.INGEST_TOKEN.encode()):
+        return jsonify(error="Invalid ingest token"), 403
+
+    # Read At Most One Byte Past The Limit, Whatever Content-Length Claims
+    too_large = jsonify(error=f"Batch larger than {config.INGEST_MAX_BYTES} bytes"), 413
+    if (request.content_length or 0) > config.INGEST_MAX_BYTES:
+        return too_large
+    payload = request.stream.read(config.INGEST_MAX_BYTES + 1)
+    if len(payload) > config.INGEST_MAX_BYTES:
+        return too_large
+
+    try:
+        raw = validate_batch(read_batch(payload, request.mimetype))
+    except ValueError as error:
+        return jsonify(error=str(error)), 400
+
+    batch_id = save_batch(raw)
+    apply_batch(raw, batch_id)
+
+    return jsonify(batch=batch_id, rows=len(raw), version=get_version()), 201
+
+
+# The drop directory is always watched; the write endpoint needs a token
+def init_app(server):
+    if config.INGEST_TOKEN:
+        server.add_url_rule("/api/invoices", "receive_invoices", receive_invoices, methods=["POST"])
+    else:
+        logger.info("DASHBOARD_INGEST_TOKEN is not set, POST /api/invoices is disabled")
+    # Threads don't survive gunicorn's fork, so each worker starts its own
+    server.before_request(start_watcher)
+    sync()
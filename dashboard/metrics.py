@@ -0,0 +1,198 @@
+# Importing Libraries
+import time
+import logging
+import threading
+import functools
+import contextlib
+from contextvars import ContextVar
+
+from flask import Response, g, has_request_context, request
+
+from dashboard import config
+
+logger = logging.getLogger(__name__)
+
+
+SECONDS_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+BYTES_BUCKETS = [1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216]
+
+
+# ----------- Prometheus-Style Histogram
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets + ["+Inf"], self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f"{name}_sum{{{labels}}} {self.sum}"
+        yield f"{name}_count{{{labels}}} {self.count}"
+
+
+# ----------- Registry
+_phases = {}    # (callback, phase) -> Histogram Of Seconds
+_payloads = {}  # callback -> Histogram Of Response Bytes
+_cache = {}     # (callback, "hit" | "miss") -> Count
+_lock = threading.Lock()
+
+# (callback name, {phase: seconds}) Of The Callback Running In This Context
+_current = ContextVar("current_callback", default=None)
+
+
+def observe_phase(callback_name, phase_name, seconds):
+    with _lock:
+        key = (callback_name, phase_name)
+        if key not in _phases:
+            _phases[key] = Histogram(SECONDS_BUCKETS)
+        _phases[key].observe(seconds)
+
+
+def observe_payload(callback_name, size):
+    with _lock:
+        if callback_name not in _payloads:
+            _payloads[callback_name] = Histogram(BYTES_BUCKETS)
+        _payloads[callback_name].observe(size)
+
+
+def record_cache(callback_name, hit):
+    key = (callback_name, "hit" if hit else "miss")
+    with _lock:
+        _cache[key] = _cache.get(key, 0) + 1
+
+
+# ----------- Timing Phases Inside A Callback
+# No-op outside an instrumented callback (e.g. during warm-up or benchmarks).
+@contextlib.contextmanager
+def phase(name):
+    current = _current.get()
+    if current is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        current[1][name] = current[1].get(name, 0.0) + elapsed
+        observe_phase(current[0], name, elapsed)
+
+
+# Wraps a page callback: filter/aggregate phases are timed where the queries
+# run, whatever is left of a computed (not cached) call is figure building.
+# The total is kept on flask.g so the request hook can derive serialization.
+def instrument(func):
+    callback_name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args):
+        phases = {}
+        token = _current.set((callback_name, phases))
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current.reset(token)
+            observe_phase(callback_name, "callback", elapsed)
+            if phases:
+                observe_phase(callback_name, "figure", max(elapsed - sum(phases.values()), 0.0))
+            if has_request_context():
+                g.callback_name = callback_name
+                g.callback_seconds = elapsed
+                g.callback_inputs = args
+
+    return wrapper
+
+
+# ----------- Request Hooks
+def start_timer():
+    if request.path.endswith("/_dash-update-component"):
+        g.request_start = time.perf_counter()
+
+
+def finish_timer(response):
+    if "request_start" not in g or "callback_name" not in g:
+        return response
+
+    total = time.perf_counter() - g.request_start
+    size = response.calculate_content_length() or 0
+
+    observe_phase(g.callback_name, "serialize", max(total - g.callback_seconds, 0.0))
+    observe_phase(g.callback_name, "request", total)
+    observe_payload(g.callback_name, size)
+
+    if config.SLOW_CALLBACK_MS and total * 1000 >= config.SLOW_CALLBACK_MS:
+        logger.warning("Slow callback %s took %.0f ms (%s bytes) for inputs %r",
+                       g.callback_name, total * 1000, size, g.callback_inputs)
+
+    return response
+
+
+# ----------- Prometheus Text Exposition
+def render():
+    with _lock:
+        phases = dict(_phases)
+        payloads = dict(_payloads)
+        lookups = dict(_cache)
+
+    lines = ["# HELP dashboard_callback_phase_seconds Time spent per callback phase",
+             "# TYPE dashboard_callback_phase_seconds histogram"]
+    for (callback_name, phase_name), histogram in sorted(phases.items()):
+        lines.extend(histogram.lines("dashboard_callback_phase_seconds",
+                                     f'callback="{callback_name}",phase="{phase_name}"'))
+
+    lines += ["# HELP dashboard_callback_response_bytes Size of callback responses",
+              "# TYPE dashboard_callback_response_bytes histogram"]
+    for callback_name, histogram in sorted(payloads.items()):
+        lines.extend(histogram.lines("dashboard_callback_response_bytes", f'callback="{callback_name}"'))
+
+    lines += ["# HELP dashboard_callback_cache_total Figure cache lookups per callback",
+              "# TYPE dashboard_callback_cache_total counter"]
+    for (callback_name, result), count in sorted(lookups.items()):
+        lines.append(f'dashboard_callback_cache_total{{callback="{callback_name}",result="{result}"}} {count}')
+
+    # Process-Wide Figure Cache Totals
+    from dashboard import cache
+    for key, value in cache.stats().items():
+        lines.append(f"dashboard_figure_cache_{key} {value}")
+
+    # Compressed HTTP Responses Served Without Running The Callback
+    from dashboard import responses
+    cached = responses.responses
+    lines.append(f"dashboard_response_cache_hits {cached.hits}")
+    lines.append(f"dashboard_response_cache_misses {cached.misses}")
+    lines.append(f"dashboard_response_cache_bytes {cached.size}")
+
+    # Startup Warm-Up, If It Ran In This Process (Or Before The Fork)
+    from dashboard import warmup
+    if warmup.last_report:
+        lines.append(f"dashboard_warmup_seconds {warmup.last_report['seconds']}")
+        lines.append(f"dashboard_warmup_states {len(warmup.last_report['states'])}")
+
+    return "\n".join(lines) + "\n"
+
+
+def metrics_view():
+    return Response(render(), mimetype="text/plain; version=0.0.4")
+
+
+def init_app(server):
+    server.before_request(start_timer)
+    server.after_request(finish_timer)
+    server.add_url_rule("/metrics", "metrics", metrics_view)
@@ -0,0 +1,95 @@
+# Importing Libraries
+import threading
+
+import numpy as np
+import pandas as pd
+
+from dashboard.cube import get_cube
+from dashboard.metrics import phase
+
+
+# ----------- Dense Per-Mall Partials
+# One row per mall: sales total, counts per gender and quantities per
+# category. A multi-select is answered by indexing these rows, so the cost
+# depends on the number of malls selected, not on the number of invoices.
+class MallPartials:
+    def __init__(self, cube):
+        self.cube = cube
+
+        sales = cube.groupby("shopping_mall", observed=True)["total_price"].sum()
+        self.malls = sales.index.tolist()
+        self.position = {mall: i for i, mall in enumerate(self.malls)}
+        self.sales = sales.to_numpy()
+
+        gender = dense(cube, "gender", "count", self.malls)
+        self.genders = gender.columns.tolist()
+        self.gender_counts = gender.to_numpy()
+
+        category = dense(cube, "category", "quantity", self.malls)
+        self.categories = category.columns.tolist()
+        self.category_quantity = category.to_numpy()
+
+    # Row positions of the selected malls, in mall order; empty means every mall
+    def rows(self, malls):
+        if not malls:
+            return np.arange(len(self.malls))
+        return np.array(sorted(self.position[mall] for mall in set(malls) if mall in self.position), dtype=np.intp)
+
+
+def dense(cube, dimension, measure, malls):
+    table = cube.groupby(["shopping_mall", dimension], observed=True)[measure].sum()
+    return table.unstack(dimension, fill_value=0).reindex(malls, fill_value=0)
+
+
+# ----------- Query The Partials
+def select(malls):
+    partials = get_partials()
+    with phase("filter"):
+        return partials, partials.rows(malls)
+
+
+def mall_index(partials, rows):
+    return pd.Index([partials.malls[row] for row in rows], name="shopping_mall")
+
+
+def sales(malls=None):
+    partials, rows = select(malls)
+    with phase("aggregate"):
+        return pd.Series(partials.sales[rows], index=mall_index(partials, rows), name="total_price")
+
+
+def gender_counts(malls=None):
+    partials, rows = select(malls)
+    with phase("aggregate"):
+        return pd.DataFrame(partials.gender_counts[rows], index=mall_index(partials, rows),
+                            columns=pd.Index(partials.genders, name="gender"))
+
+
+# Long format (shopping_mall, category, quantity), without empty pairs
+def category_quantity(malls=None):
+    partials, rows = select(malls)
+    with phase("aggregate"):
+        table = partials.category_quantity[rows]
+        mall_rows, category_columns = np.nonzero(table)
+        return pd.DataFrame({
+            "shopping_mall": [partials.malls[rows[i]] for i in mall_rows],
+            "category": [partials.categories[j] for j in category_columns],
+            "quantity": table[mall_rows, category_columns],
+        })
+
+
+# ----------- Shared Partials Per Process
+# Rebuilt (in microseconds, from the cube) whenever the cube is replaced,
+# e.g. after new invoices were appended.
+_partials = None
+_lock = threading.Lock()
+
+
+def get_partials():
+    global _partials
+    cube = get_cube()
+    if _partials is None or _partials.cube is not cube:
+        with _lock:
+            if _partials is None or _partials.cube is not cube:
+                _partials = MallPartials(cube)
+    return _partials
@@ -0,0 +1,469 @@
+# Importing Libraries
+import os
+import queue
+import sqlite3
+import threading
+import contextlib
+
+import numpy as np
+import pandas as pd
+
+from dashboard import config, crossfilter, cube, customers, dates, distinct, partials, sketches
+from dashboard.metrics import phase
+from dashboard.data import get_data, iter_chunks, load_data, on_append
+from dashboard.store import CATEGORICAL_COLUMNS
+
+
+# ----------- Backend Interface
+# Everything the page callbacks ask for. years: "all"/None, a year or a list
+# of years; malls: None/[] for every mall; start/end: inclusive "YYYY-MM-DD".
+class Backend:
+    def total(self, measure, years=None, malls=None):
+        raise NotImplementedError
+
+    # Series indexed by the dimension(s), observed groups only, in sort order
+    def rollup(self, dimension, measure, years=None, malls=None):
+        raise NotImplementedError
+
+    def count_customers(self, years=None):
+        raise NotImplementedError
+
+    def range_total(self, measure, start=None, end=None):
+        raise NotImplementedError
+
+    def range_customers(self, start=None, end=None):
+        raise NotImplementedError
+
+    def years(self):
+        raise NotImplementedError
+
+    def bounds(self):
+        raise NotImplementedError
+
+    # Series of one measure per day with sales, indexed by day
+    def daily_series(self, measure):
+        raise NotImplementedError
+
+    def malls(self):
+        return self.rollup("shopping_mall", "count").index.tolist()
+
+    # ----------- Shopping Malls Page
+    def mall_sales(self, malls=None):
+        return self.rollup("shopping_mall", "total_price", malls=malls)
+
+    def gender_counts(self, malls=None):
+        return self.rollup(["shopping_mall", "gender"], "count", malls=malls).unstack("gender", fill_value=0)
+
+    def category_quantity(self, malls=None):
+        return self.rollup(["shopping_mall", "category"], "quantity", malls=malls).reset_index()
+
+    def top_bottom_mall(self, malls=None):
+        sales = self.mall_sales(malls)
+        return sales.idxmax(), sales.idxmin()
+
+    # ----------- Customers Page
+    # Served by the in-process per-customer table whatever the backend: it
+    # holds one row per customer, not per invoice.
+    def customer_totals(self, gender="all", ages=None):
+        return customers.totals(gender, ages)
+
+    def customer_rollup(self, dimension, measure, gender="all", ages=None):
+        return customers.rollup(dimension, measure, gender, ages)
+
+    def age_bounds(self):
+        return customers.age_bounds()
+
+    # ----------- Sales Page Crossfilter
+    # One chart's totals under the clicks on the other charts. Without clicks
+    # it is a plain roll-up; with clicks it is served by the in-process
+    # crossfilter over the cube whatever the backend.
+    def crossfilter_rollup(self, dimension, measure, years=None, selections=()):
+        if not selections:
+            return self.rollup(dimension, measure, years)
+        return crossfilter.groups(dimension, measure, years, selections)
+
+    # ----------- Distributions
+    # Merged from the in-process sketches kept per (mall, category, year)
+    def price_quantiles(self, probabilities, years=None, malls=None):
+        return sketches.price_quantiles(probabilities, years, malls)
+
+    def age_histogram(self, years=None, malls=None):
+        return sketches.age_histogram(years, malls)
+
+
+# ----------- In-Process Pandas Backend
+# The cube, the date index, the distinct counter and the per-mall partials.
+class PandasBackend(Backend):
+    def total(self, measure, years=None, malls=None):
+        return cube.total(measure, years, malls)
+
+    def rollup(self, dimension, measure, years=None, malls=None):
+        return cube.rollup(dimension, measure, years, malls)
+
+    def count_customers(self, years=None):
+        return distinct.count_customers(years)
+
+    def range_total(self, measure, start=None, end=None):
+        return dates.total(measure, start, end)
+
+    def range_customers(self, start=None, end=None):
+        return dates.count_customers(start, end)
+
+    def years(self):
+        return dates.get_index().years()
+
+    def bounds(self):
+        return dates.get_index().bounds()
+
+    def daily_series(self, measure):
+        return dates.get_index().daily[measure]
+
+    def malls(self):
+        return partials.get_partials().malls
+
+    def mall_sales(self, malls=None):
+        return partials.sales(malls)
+
+    def gender_counts(self, malls=None):
+        return partials.gender_counts(malls)
+
+    def category_quantity(self, malls=None):
+        return partials.category_quantity(malls)
+
+
+# ----------- Connection Pool
+# Idle connections are reused by concurrent callbacks; a pool inherited
+# through fork() is discarded, connections never cross processes.
+class ConnectionPool:
+    def __init__(self, connect, size):
+        self.connect = connect
+        self.size = size
+        self.pid = os.getpid()
+        self.idle = queue.LifoQueue()
+
+    @contextlib.contextmanager
+    def connection(self):
+        if self.pid != os.getpid():
+            self.pid, self.idle = os.getpid(), queue.LifoQueue()
+
+        try:
+            connection = self.idle.get_nowait()
+        except queue.Empty:
+            connection = self.connect()
+
+        try:
+            yield connection
+        finally:
+            if self.idle.qsize() < self.size:
+                self.idle.put(connection)
+            else:
+                connection.close()
+
+
+# ----------- Embedded SQL Backend (SQLite, Or DuckDB When Installed)
+# One database file per source version, built once from the column store
+# chunk by chunk, so only one chunk is ever held in memory.
+SCHEMA = """
+CREATE TABLE invoices (
+    customer_id TEXT, age INTEGER, gender TEXT, invoice_date TEXT, year INTEGER, month INTEGER,
+    category TEXT, shopping_mall TEXT, payment_method TEXT, quantity INTEGER, price REAL, total_price REAL
+);
+CREATE TABLE applied_batches (batch_id TEXT PRIMARY KEY);
+"""
+
+# Part Of The Database File Name, So Files With An Older Schema Are Rebuilt
+SCHEMA_VERSION = 2
+
+INDEXES = """
+CREATE INDEX invoices_date ON invoices (invoice_date);
+CREATE INDEX invoices_year ON invoices (year);
+CREATE INDEX invoices_mall ON invoices (shopping_mall);
+"""
+
+SQL_COLUMNS = ["customer_id", "age", "gender", "invoice_date", "year", "month", "category",
+               "shopping_mall", "payment_method", "quantity", "price", "total_price"]
+
+
+def sql_frame(df):
+    days = df["invoice_date"].to_numpy().astype("datetime64[D]")
+    frame = pd.DataFrame({column: df[column].astype(object) if column in CATEGORICAL_COLUMNS else df[column]
+                          for column in df.columns if column in SQL_COLUMNS})
+    frame["invoice_date"] = np.datetime_as_string(days, unit="D")
+    frame["year"] = days.astype("datetime64[Y]").astype(np.int64) + 1970
+    frame["month"] = days.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    return frame[SQL_COLUMNS]
+
+
+def measure_sql(measure):
+    return "COUNT(*)" if measure == "count" else f"SUM({measure})"
+
+
+def where_sql(years=None, malls=None, start=None, end=None):
+    clauses, params = [], []
+    if years is not None and years != "all":
+        years = list(years) if isinstance(years, (list, tuple, set)) else [years]
+        clauses.append(f"year IN ({', '.join('?' * len(years))})")
+        params += [int(year) for year in years]
+    if malls:
+        clauses.append(f"shopping_mall IN ({', '.join('?' * len(malls))})")
+        params += list(malls)
+    if start:
+        clauses.append("invoice_date >= ?")
+        params.append(str(start)[:10])
+    if end:
+        clauses.append("invoice_date <= ?")
+        params.append(str(end)[:10])
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+class SQLBackend(Backend):
+    def __init__(self, engine, path):
+        self.engine = engine
+        self.path = path
+        if engine == "duckdb":
+            import duckdb
+            # One Database Instance Per Process, One Cursor Per Connection
+            database = duckdb.connect(path)
+            connect = database.cursor
+        else:
+            connect = lambda: sqlite3.connect(path, check_same_thread=False)
+        self.pool = ConnectionPool(connect, config.SQL_POOL_SIZE)
+
+    def query(self, sql, params=()):
+        with phase("aggregate"), self.pool.connection() as connection:
+            return connection.execute(sql, params).fetchall()
+
+    def scalar(self, sql, params=()):
+        value = self.query(sql, params)[0][0]
+        return value if value is not None else 0
+
+    def total(self, measure, years=None, malls=None):
+        where, params = where_sql(years, malls)
+        return self.scalar(f"SELECT {measure_sql(measure)} FROM invoices{where}", params)
+
+    def rollup(self, dimension, measure, years=None, malls=None):
+        dimensions = dimension if isinstance(dimension, (list, tuple)) else [dimension]
+        keys = ", ".join(dimensions)
+        where, params = where_sql(years, malls)
+        rows = self.query(f"SELECT {keys}, {measure_sql(measure)} FROM invoices{where} "
+                          f"GROUP BY {keys} ORDER BY {keys}", params)
+        return pd.DataFrame(rows, columns=list(dimensions) + [measure]).set_index(dimension)[measure]
+
+    def count_customers(self, years=None):
+        where, params = where_sql(years)
+        return self.scalar(f"SELECT COUNT(DISTINCT customer_id) FROM invoices{where}", params)
+
+    def range_total(self, measure, start=None, end=None):
+        where, params = where_sql(start=start, end=end)
+        return self.scalar(f"SELECT {measure_sql(measure)} FROM invoices{where}", params)
+
+    def range_customers(self, start=None, end=None):
+        where, params = where_sql(start=start, end=end)
+        return self.scalar(f"SELECT COUNT(DISTINCT customer_id) FROM invoices{where}", params)
+
+    def years(self):
+        return [year for (year,) in self.query("SELECT DISTINCT year FROM invoices ORDER BY year")]
+
+    def bounds(self):
+        first_day, last_day = self.query("SELECT MIN(invoice_date), MAX(invoice_date) FROM invoices")[0]
+        if first_day is None:
+            return None, None
+        return np.datetime64(first_day, "D"), np.datetime64(last_day, "D")
+
+    def daily_series(self, measure):
+        rows = self.query(f"SELECT invoice_date, {measure_sql(measure)} FROM invoices "
+                          f"GROUP BY invoice_date ORDER BY invoice_date")
+        days = np.array([day for day, _ in rows], dtype="datetime64[D]")
+        return pd.Series([value for _, value in rows], index=pd.Index(days, name="day"), name=measure)
+
+    # Every worker applies every batch; the batch id makes that idempotent,
+    # while two batches with the same rows are still both inserted
+    def append(self, batch, batch_id):
+        with self.pool.connection() as connection:
+            # SQLite: Take The Write Lock Up Front So Two Workers Cannot Both Insert
+            connection.execute("BEGIN TRANSACTION" if self.engine == "duckdb" else "BEGIN IMMEDIATE")
+            try:
+                seen = connection.execute("SELECT 1 FROM applied_batches WHERE batch_id = ?", [batch_id]).fetchall()
+                if not seen:
+                    connection.execute("INSERT INTO applied_batches VALUES (?)", [batch_id])
+                    insert_frame(connection, self.engine, sql_frame(batch))
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+
+
+def insert_frame(connection, engine, frame):
+    if engine == "duckdb":
+        connection.register("chunk", frame)
+        connection.execute("INSERT INTO invoices SELECT * FROM chunk")
+        connection.unregister("chunk")
+    else:
+        placeholders = ", ".join("?" * len(SQL_COLUMNS))
+        connection.executemany(f"INSERT INTO invoices VALUES ({placeholders})",
+                               frame.itertuples(index=False, name=None))
+
+
+# Built into a temporary file and renamed, so a half-written database is
+# never opened by another worker.
+def build_database(engine, path):
+    temporary = f"{path}.tmp-{os.getpid()}"
+    if os.path.exists(temporary):
+        os.remove(temporary)
+
+    if engine == "duckdb":
+        import duckdb
+        connection = duckdb.connect(temporary)
+    else:
+        connection = sqlite3.connect(temporary)
+        connection.execute("PRAGMA journal_mode=WAL")
+
+    for statement in SCHEMA.split(";"):
+        if statement.strip():
+            connection.execute(statement)
+    for chunk in iter_chunks(load_data()):
+        insert_frame(connection, engine, sql_frame(chunk))
+    for statement in INDEXES.split(";"):
+        if statement.strip():
+            connection.execute(statement)
+    connection.commit()
+    connection.close()
+
+    os.replace(temporary, path)
+
+
+def open_sql_backend(engine):
+    extension = "duckdb" if engine == "duckdb" else "sqlite"
+    path = os.path.join(config.CACHE_DIR, f"query-{get_data().attrs['version']}-v{SCHEMA_VERSION}.{extension}")
+    if not os.path.exists(path):
+        os.makedirs(config.CACHE_DIR, exist_ok=True)
+        build_database(engine, path)
+    return SQLBackend(engine, path)
+
+
+# ----------- Shared Backend Per Process
+_backend = None
+_pending = []
+_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _lock:
+            if _backend is None:
+                if config.QUERY_BACKEND == "pandas":
+                    backend = PandasBackend()
+                else:
+                    backend = open_sql_backend(config.QUERY_BACKEND)
+                    # Batches Appended Before The Database Was Opened
+                    for batch, batch_id in _pending:
+                        backend.append(batch, batch_id)
+                    _pending.clear()
+                _backend = backend
+    return _backend
+
+
+# The database is built from the source only; appended invoices are added
+# to it here (the pandas backend keeps its own listeners). The insert runs
+# once every in-process listener has built its new state.
+@on_append
+def update_backend(batch, batch_id):
+    if config.QUERY_BACKEND == "pandas":
+        return None
+
+    def commit():
+        with _lock:
+            if _backend is None:
+                _pending.append((batch, batch_id))
+            else:
+                _backend.append(batch, batch_id)
+    return commit
+
+
+# ----------- Shortcuts Used By The Pages
+def total(measure, years=None, malls=None):
+    return get_backend().total(measure, years, malls)
+
+
+def rollup(dimension, measure, years=None, malls=None):
+    return get_backend().rollup(dimension, measure, years, malls)
+
+
+def count_customers(years=None):
+    return get_backend().count_customers(years)
+
+
+def range_total(measure, start=None, end=None):
+    return get_backend().range_total(measure, start, end)
+
+
+def range_customers(start=None, end=None):
+    return get_backend().range_customers(start, end)
+
+
+def years():
+    return get_backend().years()
+
+
+def bounds():
+    return get_backend().bounds()
+
+
+# The Days A Year Menu Option Covers, Clamped To The Data ("all": Every Day)
+def option_range(option):
+    first_day, last_day = bounds()
+
+    if option != "all" and option is not None:
+        start, end = dates.year_range(option)
+        first_day, last_day = max(start, first_day), min(end, last_day)
+
+    return str(first_day), str(last_day)
+
+
+def daily_series(measure):
+    return get_backend().daily_series(measure)
+
+
+def malls():
+    return get_backend().malls()
+
+
+def mall_sales(malls=None):
+    return get_backend().mall_sales(malls)
+
+
+def gender_counts(malls=None):
+    return get_backend().gender_counts(malls)
+
+
+def category_quantity(malls=None):
+    return get_backend().category_quantity(malls)
+
+
+def top_bottom_mall(malls=None):
+    return get_backend().top_bottom_mall(malls)
+
+
+def customer_totals(gender="all", ages=None):
+    return get_backend().customer_totals(gender, ages)
+
+
+def customer_rollup(dimension, measure, gender="all", ages=None):
+    return get_backend().customer_rollup(dimension, measure, gender, ages)
+
+
+def age_bounds():
+    return get_backend().age_bounds()
+
+
+def crossfilter_rollup(dimension, measure, years=None, selections=()):
+    return get_backend().crossfilter_rollup(dimension, measure, years, selections)
+
+
+def price_quantiles(probabilities, years=None, malls=None):
+    return get_backend().price_quantiles(probabilities, years, malls)
+
+
+def age_histogram(years=None, malls=None):
+    return get_backend().age_histogram(years, malls)
@@ -0,0 +1,101 @@
+# Importing Libraries
+import gzip
+import hashlib
+
+from flask import Response, g, request
+
+from dashboard import config
+from dashboard.cache import LRUCache
+from dashboard.data import get_generation, get_version
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Dash Endpoints Whose Bodies Only Depend On The Data Version And The Request
+PATHS = ("/_dash-update-component", "/_dash-layout", "/_dash-dependencies")
+
+# (etag, content-encoding) -> (body, content-type)
+responses = LRUCache(config.RESPONSE_CACHE_ENTRIES, config.RESPONSE_CACHE_BYTES)
+
+
+# ----------- Version + Inputs ETag
+def request_etag():
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (get_version(), request.method, request.path, request.query_string):
+        digest.update(part.encode() if isinstance(part, str) else part)
+        digest.update(b"\0")
+    digest.update(request.get_data(cache=True))
+    return digest.hexdigest()
+
+
+def pick_encoding():
+    offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return request.accept_encodings.best_match(offered) or "identity"
+
+
+def compress(body, encoding):
+    if encoding == "br":
+        return brotli.compress(body, quality=config.COMPRESS_LEVEL)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=config.COMPRESS_LEVEL)
+    return body
+
+
+def cacheable(response):
+    return response.status_code == 200 and not response.direct_passthrough and "Content-Encoding" not in response.headers
+
+
+# Weak ETag, because the same entity is served gzip, brotli or uncompressed
+def finish(response, etag, encoding):
+    response.set_etag(etag, weak=True)
+    response.headers["Cache-Control"] = "no-cache"
+    response.vary.add("Accept-Encoding")
+    if encoding != "identity":
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+# ----------- Request Hooks
+# Conditional requests with a matching ETag get a 304 before any callback
+# runs; repeated requests are answered from the compressed-response cache.
+def serve_cached():
+    if not request.path.endswith(PATHS):
+        return None
+
+    g.response_generation = get_generation()
+    g.response_etag = etag = request_etag()
+    g.response_encoding = encoding = pick_encoding()
+
+    if request.if_none_match.contains_weak(etag):
+        return finish(Response(status=304), etag, "identity")
+
+    cached = responses.get((etag, encoding))
+    if cached is not None:
+        body, mimetype = cached
+        return finish(Response(body, mimetype=mimetype), etag, encoding)
+    return None
+
+
+def compress_response(response):
+    if "response_etag" not in g or not cacheable(response):
+        return response
+
+    # A Batch Was Applied Meanwhile: The Body May Not Match The ETag's Version
+    if g.response_generation % 2 or get_generation() != g.response_generation:
+        return response
+
+    body = response.get_data()
+    encoding = g.response_encoding if len(body) >= config.COMPRESS_MIN_BYTES else "identity"
+    body = compress(body, encoding)
+
+    response.set_data(body)
+    responses.set((g.response_etag, encoding), (body, response.mimetype), len(body))
+    return finish(response, g.response_etag, encoding)
+
+
+def init_app(server):
+    server.before_request(serve_cached)
+    server.after_request(compress_response)
@@ -0,0 +1,134 @@
+# Importing Libraries
+import math
+import threading
+
+import numpy as np
+import pandas as pd
+
+from dashboard import config
+from dashboard.engine import aggregate
+from dashboard.metrics import phase
+from dashboard.data import get_data, iter_chunks, on_append, period_columns
+
+
+# Every Sketch & Histogram Is Kept Per Combination Of These
+KEYS = ["shopping_mall", "category", "year"]
+
+MAX_AGE = 120
+
+
+# ----------- Log-Bucket Quantile Sketch
+# Bucket i holds the prices in (gamma^(i-1), gamma^i]. Reporting a bucket by
+# its midpoint keeps every quantile within SKETCH_ACCURACY relative error,
+# whatever the number of rows, and two sketches merge by adding counts.
+GAMMA = (1 + config.SKETCH_ACCURACY) / (1 - config.SKETCH_ACCURACY)
+MIN_PRICE = 0.01
+
+
+def price_bucket(prices):
+    return np.ceil(np.log(np.maximum(prices, MIN_PRICE)) / math.log(GAMMA)).astype(np.int32)
+
+
+def bucket_price(buckets):
+    return 2 * GAMMA ** np.asarray(buckets, dtype=float) / (GAMMA + 1)
+
+
+# ----------- Build The Sketch Tables
+# Long format, one row per key combination and price bucket (or age), so the
+# tables merge and filter exactly like the cube.
+def build_sketches(df):
+    year, _ = period_columns(df)
+    keys = {"shopping_mall": df["shopping_mall"], "category": df["category"], "year": year}
+
+    prices = aggregate({**keys, "bucket": price_bucket(df["price"].to_numpy())}, {"count": (df["price"], "count")})
+    ages = aggregate({**keys, "age": np.clip(df["age"].to_numpy(), 0, MAX_AGE)}, {"count": (df["age"], "count")})
+    return prices, ages
+
+
+def merge_tables(column, *tables):
+    table = pd.concat(tables, ignore_index=True)
+    return aggregate({key: table[key] for key in KEYS + [column]}, {"count": (table["count"], "sum")})
+
+
+def merge_sketches(sketches, update):
+    return merge_tables("bucket", sketches[0], update[0]), merge_tables("age", sketches[1], update[1])
+
+
+def build_sketches_from(chunks):
+    sketches = None
+    for chunk in chunks:
+        chunk_sketches = build_sketches(chunk)
+        sketches = chunk_sketches if sketches is None else merge_sketches(sketches, chunk_sketches)
+    return sketches if sketches is not None else build_sketches(get_data().iloc[:0])
+
+
+# ----------- Query The Sketches
+# years: "all", one year or a list of years; malls: None/[] for every mall
+def select(table, years=None, malls=None):
+    with phase("filter"):
+        if years is not None and years != "all":
+            table = table[table["year"].isin(years if isinstance(years, (list, tuple, set)) else [years])]
+        if malls:
+            table = table[table["shopping_mall"].isin(malls)]
+        return table
+
+
+# One row per category, one column per probability (prices)
+def price_quantiles(probabilities, years=None, malls=None):
+    table = select(get_sketches()[0], years, malls)
+
+    with phase("aggregate"):
+        merged = table.groupby(["category", "bucket"], observed=True)["count"].sum()
+
+        rows = {}
+        for category, counts in merged.groupby(level="category", observed=True):
+            cumulative = np.cumsum(counts.to_numpy())
+            ranks = np.asarray(probabilities) * (cumulative[-1] - 1)
+            buckets = counts.index.get_level_values("bucket").to_numpy()
+            rows[category] = bucket_price(buckets[np.searchsorted(cumulative, ranks, "right")])
+
+        return pd.DataFrame.from_dict(rows, orient="index", columns=list(probabilities)).rename_axis("category")
+
+
+# Invoices per year of customer age
+def age_histogram(years=None, malls=None):
+    table = select(get_sketches()[1], years, malls)
+    with phase("aggregate"):
+        return table.groupby("age")["count"].sum()
+
+
+# ----------- Shared Sketches Per Process
+_sketches = None
+_lock = threading.Lock()
+
+
+def get_sketches():
+    global _sketches
+    if _sketches is None:
+        with _lock:
+            if _sketches is None:
+                _sketches = build_sketches_from(iter_chunks())
+    return _sketches
+
+
+# Call After The Underlying Data Changed
+def rebuild_sketches(df=None):
+    global _sketches
+    sketches = build_sketches_from(iter_chunks(df))
+    with _lock:
+        _sketches = sketches
+    return sketches
+
+
+# Add Appended Invoices To The Sketches
+@on_append
+def update_sketches(batch, batch_id):
+    if _sketches is None:
+        return None
+    sketches = merge_sketches(_sketches, build_sketches(batch))
+
+    def commit():
+        global _sketches
+        with _lock:
+            _sketches = sketches
+    return commit
@@ -0,0 +1,208 @@
+# Importing Libraries
+import os
+import json
+import shutil
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+
+from dashboard import config
+
+
+# Order Of Columns In The Cleaned Data
+COLUMNS = ["customer_id", "age", "gender", "invoice_date",
+           "category", "shopping_mall", "payment_method",
+           "quantity", "price", "total_price"]
+
+# Text Columns Stored As Integer Codes + Categories
+CATEGORICAL_COLUMNS = ["customer_id", "gender", "category", "shopping_mall", "payment_method"]
+
+CACHE_FORMAT = 3
+
+
+# ----------- Source Fingerprint
+def file_hash(path, block_size=1 << 20):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_stat(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def cache_path(path):
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(config.CACHE_DIR, name)
+
+
+def code_dtype(n_categories):
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+# ----------- Append-Only Column Writer
+# Every column is a raw little-endian array in its own file so it can be
+# memory mapped back without parsing. Text columns are written as codes into
+# a category table that is shared by every chunk and bucket of one store.
+class StoreWriter:
+    def __init__(self, directory, categories=None):
+        self.directory = directory
+        self.rows = 0
+        self.dtypes = {}
+        self.categories = categories if categories is not None else {column: {} for column in CATEGORICAL_COLUMNS}
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, column):
+        return os.path.join(self.directory, f"{column}.bin")
+
+    def encode(self, column, values):
+        lookup = self.categories[column]
+        mapping = np.array([lookup.setdefault(value, len(lookup)) for value in values.categories] + [-1], dtype=np.int32)
+        # Missing Values Have Code -1 Which Picks The Trailing -1
+        return mapping[values.codes]
+
+    def values(self, column, series):
+        if column in CATEGORICAL_COLUMNS:
+            return self.encode(column, series.array)
+        if column == "invoice_date":
+            return series.to_numpy(dtype="datetime64[ns]").view("i8")
+        return series.to_numpy()
+
+    def append(self, df):
+        self.write({column: self.values(column, df[column]) for column in COLUMNS})
+
+    def write(self, arrays):
+        for column, values in arrays.items():
+            dtype = self.dtypes.setdefault(column, values.dtype)
+            with open(self.path(column), "ab") as f:
+                np.ascontiguousarray(values, dtype=dtype).tofile(f)
+        self.rows += len(arrays[COLUMNS[0]])
+
+    def read(self, column):
+        if self.rows == 0:
+            return np.empty(0, self.dtypes.get(column, np.int64))
+        return np.memmap(self.path(column), dtype=self.dtypes[column], mode="r", shape=(self.rows,))
+
+
+# ----------- Build A Store From Cleaned Chunks
+# Chunks are spilled into one bucket per month first, then every month is
+# sorted on its own and appended in order. Only one month of rows is ever in
+# memory, yet the final store is sorted by invoice_date like clean_data().
+def write_store(chunks, directory, source):
+    tmp_dir = f"{directory}.tmp-{os.getpid()}-{threading.get_ident()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    categories = {column: {} for column in CATEGORICAL_COLUMNS}
+    buckets = {}
+    for chunk in chunks:
+        months = chunk["invoice_date"].to_numpy().astype("datetime64[M]")
+        for month in np.unique(months):
+            if month not in buckets:
+                buckets[month] = StoreWriter(os.path.join(tmp_dir, "buckets", str(month)), categories)
+            buckets[month].append(chunk[months == month])
+
+    # Categories Sorted Like astype("category") Would Sort Them
+    remap, columns = {}, {}
+    for column, lookup in categories.items():
+        values = np.array(list(lookup), dtype=str)
+        order = np.argsort(values, kind="stable")
+        remap[column] = np.empty(len(values) + 1, dtype=code_dtype(len(values)))
+        remap[column][order] = np.arange(len(values))
+        remap[column][-1] = -1
+        np.save(os.path.join(tmp_dir, f"{column}.categories.npy"), values[order])
+        columns[column] = {"dtype": remap[column].dtype.str, "categorical": True}
+
+    store = StoreWriter(tmp_dir, categories)
+    for month in sorted(buckets):
+        bucket = buckets[month]
+        arrays = {column: bucket.read(column) for column in COLUMNS}
+        order = np.argsort(arrays["invoice_date"], kind="stable")
+        store.write({
+            column: remap[column][values[order]] if column in remap else values[order]
+            for column, values in arrays.items()
+        })
+    shutil.rmtree(os.path.join(tmp_dir, "buckets"), ignore_errors=True)
+
+    for column in COLUMNS:
+        if column not in columns:
+            columns[column] = {"dtype": store.dtypes.get(column, np.dtype(np.int64)).str}
+    columns["invoice_date"]["datetime"] = "ns"
+
+    meta = {"format": CACHE_FORMAT, "rows": store.rows, "columns": columns, "source": source}
+    with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+        json.dump(meta, f)
+
+    # Swap The New Cache In Place (Another Worker May Have Won The Race)
+    shutil.rmtree(directory, ignore_errors=True)
+    try:
+        os.rename(tmp_dir, directory)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return meta
+
+
+# ----------- Read The Store Back
+def read_meta(directory):
+    try:
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    return meta if meta.get("format") == CACHE_FORMAT else None
+
+
+def is_fresh(meta, path):
+    if meta is None:
+        return False
+
+    cached, current = meta["source"], source_stat(path)
+    if cached["size"] != current["size"]:
+        return False
+    if cached["mtime_ns"] == current["mtime_ns"]:
+        return True
+
+    # Touched But Maybe Not Changed -> Compare Content Hash
+    if cached["hash"] != file_hash(path):
+        return False
+
+    meta["source"].update(current)
+    try:
+        with open(os.path.join(cache_path(path), "meta.json"), "w") as f:
+            json.dump(meta, f)
+    except OSError:
+        pass
+
+    return True
+
+
+def read_column(directory, column, meta):
+    info = meta["columns"][column]
+    if meta["rows"] == 0:
+        values = np.empty(0, dtype=np.dtype(info["dtype"]))
+    else:
+        values = np.memmap(os.path.join(directory, f"{column}.bin"),
+                           dtype=np.dtype(info["dtype"]), mode="r", shape=(meta["rows"],))
+
+    if info.get("categorical"):
+        categories = np.load(os.path.join(directory, f"{column}.categories.npy"))
+        return pd.Categorical.from_codes(values, categories=categories, validate=False)
+    if "datetime" in info:
+        return values.view(f"datetime64[{info['datetime']}]")
+    return values
+
+
+# Columns stay backed by the memory mapped files (copy=False), so the rows
+# live in the page cache instead of the worker's heap.
+def read_store(directory, meta):
+    columns = {column: pd.Series(read_column(directory, column, meta), copy=False) for column in COLUMNS}
+    return pd.DataFrame(columns, copy=False)
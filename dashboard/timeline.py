@@ -0,0 +1,98 @@
+# Importing Libraries
+import threading
+
+import numpy as np
+import pandas as pd
+
+from dashboard import config, query
+from dashboard.dates import parse_day
+from dashboard.metrics import phase
+from dashboard.data import get_version
+
+
+# Finest Resolution First; A Window Uses The Finest One That Is Small Enough
+LEVELS = [("Daily", None), ("Weekly", "W-MON"), ("Monthly", "MS")]
+
+# A level is downsampled when it has up to this many times max_points in the
+# window; beyond that the next coarser level is used instead.
+OVERSAMPLE = 8
+
+
+# ----------- Largest-Triangle-Three-Buckets Downsampling
+# Keeps the first and last point and, per bucket, the point forming the
+# largest triangle with the previous pick and the next bucket's average,
+# so peaks and dips survive. Returns the indices of the kept points.
+def lttb(x, y, threshold):
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    bounds = np.append(np.linspace(1, n - 1, threshold - 1).astype(np.int64), n)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    previous = 0
+    for i in range(threshold - 2):
+        start, stop = bounds[i], bounds[i + 1]
+        next_start, next_stop = bounds[i + 1], bounds[i + 2]
+        average_x, average_y = x[next_start:next_stop].mean(), y[next_start:next_stop].mean()
+
+        area = np.abs((x[previous] - average_x) * (y[start:stop] - y[previous])
+                      - (x[previous] - x[start:stop]) * (average_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+
+    return selected
+
+
+# ----------- Multi-Resolution Series
+# Every level is binned once from the daily totals (missing days count as 0)
+class Timeline:
+    def __init__(self, daily):
+        daily = pd.Series(daily.to_numpy(dtype=float), index=pd.DatetimeIndex(daily.index))
+        if len(daily):
+            daily = daily.asfreq("D", fill_value=0.0)
+
+        self.levels = []
+        for name, rule in LEVELS:
+            binned = daily if rule is None else daily.resample(rule, label="left", closed="left").sum()
+            self.levels.append((name, binned.index.to_numpy().astype("datetime64[D]"), binned.to_numpy()))
+
+    # start/end: inclusive datetime64 days or None; returns (level name, x, y)
+    # with at most max_points points
+    def window(self, start=None, end=None, max_points=None):
+        max_points = max_points or config.TIMELINE_MAX_POINTS
+
+        for level, (name, x, y) in enumerate(self.levels):
+            first = 0 if start is None else np.searchsorted(x, start, "left")
+            last = len(x) if end is None else np.searchsorted(x, end, "right")
+            if last - first <= max_points * OVERSAMPLE or level == len(self.levels) - 1:
+                break
+
+        x, y = x[first:last], y[first:last]
+        kept = lttb(x.astype(np.int64).astype(float), y, max_points)
+        return name, x[kept], y[kept]
+
+
+# ----------- Shared Timeline Per Process (Per Data Version)
+_timeline = None
+_timeline_version = None
+_lock = threading.Lock()
+
+
+def get_timeline():
+    global _timeline, _timeline_version
+    version = get_version()
+    if _timeline_version != version:
+        with _lock:
+            if _timeline_version != version:
+                _timeline = Timeline(query.daily_series("total_price"))
+                _timeline_version = version
+    return _timeline
+
+
+# start/end: "YYYY-MM-DD" strings (as sent by Plotly) or None
+def window(start=None, end=None, max_points=None):
+    timeline = get_timeline()
+    with phase("aggregate"):
+        return timeline.window(parse_day(start), parse_day(end), max_points)
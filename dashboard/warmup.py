@@ -0,0 +1,96 @@
+# Importing Libraries
+import sys
+import time
+import logging
+import importlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from dashboard import cache, config, query
+
+logger = logging.getLogger(__name__)
+
+# Report Of The Last Run (Shown On /metrics)
+last_report = None
+
+
+# Memoized Page Callbacks And The Control Whose States They Depend On
+CALLBACKS = {
+    "pages.home": [("build_card", "year-menu"), ("build_line_chart", "sales-charts"), ("build_pie_bar", "sales-charts"),
+                   ("build_bar_charts", "sales-charts"), ("load_sales_aggregates", "year-menu"),
+                   ("build_timeline_figure", "timeline"), ("build_distributions", "year-menu")],
+    "pages.malls": [("build_max_min_card", "malls-menu"), ("build_bar_mall_gender", "malls-menu"),
+                    ("build_scatter_mall_category", "malls-menu"), ("build_price_distribution", "malls-menu"),
+                    ("build_age_histogram", "malls-menu")],
+    "pages.customers": [("build_customer_cards", "customer-filters"), ("build_segment_chart", "customer-filters"),
+                        ("build_frequency_chart", "customer-filters"), ("build_age_band_chart", "customer-filters")],
+}
+
+
+# ----------- Enumerate Dashboard States
+# Every state is the tuple of callback arguments
+def menu_states(menu):
+    years = ["all"] + query.years()
+    if menu == "year-menu":
+        return [(year,) for year in years]
+    if menu == "sales-charts":
+        # Each Year Option Before Any Chart Is Clicked
+        return [(year, []) for year in years]
+    if menu == "timeline":
+        # Fully Zoomed Out
+        return [(None, None)]
+    if menu == "customer-filters":
+        # Each Gender Option Over The Full Age Range
+        ages = list(query.age_bounds())
+        return [(gender, ages) for gender in ["all"] + query.customer_rollup("gender", "customers").index.tolist()]
+    # Every Single Mall Plus "All Malls" (Nothing Selected)
+    return [([],)] + [([mall],) for mall in query.malls()]
+
+
+def states():
+    for module_name, callbacks in CALLBACKS.items():
+        module = sys.modules.get(module_name) or importlib.import_module(module_name)
+        for name, menu in callbacks:
+            if hasattr(module, name):
+                for args in menu_states(menu):
+                    yield module_name, name, args
+
+
+# ----------- Build One State
+def build(module_name, name, args):
+    func = getattr(sys.modules[module_name], name)
+    start = time.perf_counter()
+    value = func.uncached(*args)
+    return value, time.perf_counter() - start
+
+
+# Threads fill this process's cache directly; with processes the results are
+# sent back and stored here (and in the shared disk cache, when enabled).
+def run(mode=None, workers=None):
+    global last_report
+    mode = mode or config.WARMUP
+    workers = workers or config.WARMUP_WORKERS
+    todo = list(states())
+
+    if mode == "process":
+        context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else None)
+        executor = ProcessPoolExecutor(workers, mp_context=context)
+    else:
+        executor = ThreadPoolExecutor(workers)
+
+    start = time.perf_counter()
+    report = []
+    with executor:
+        futures = [(state, executor.submit(build, *state)) for state in todo]
+        for (module_name, name, args), future in futures:
+            value, seconds = future.result()
+            cache.store(getattr(sys.modules[module_name], name).cache_key(*args), value)
+            report.append({"callback": f"{module_name}.{name}", "input": args, "seconds": seconds})
+
+    total = time.perf_counter() - start
+    logger.info("Warm-up built %d states in %.2fs", len(report), total)
+    for entry in sorted(report, key=lambda entry: -entry["seconds"]):
+        logger.info("  %-45s %-30r %.3fs", entry["callback"], entry["input"], entry["seconds"])
+
+    last_report = {"seconds": total, "mode": mode, "workers": workers, "states": report}
+    return last_report
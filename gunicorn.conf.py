@@ -0,0 +1,46 @@
+# Gunicorn Settings
+# Run With: gunicorn -c gunicorn.conf.py main:server
+import os
+import multiprocessing
+
+
+bind = os.environ.get("DASHBOARD_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+
+# Threaded Workers: A Long Export Download Streams On One Thread While The
+# Same Worker Keeps Answering Callbacks On The Others (1 Thread Would Block It)
+worker_class = "gthread"
+threads = int(os.environ.get("DASHBOARD_THREADS", 4))
+
+# Import The App Once In The Master; Workers Fork With The Data Already Attached
+preload_app = os.environ.get("DASHBOARD_PRELOAD", "1") == "1"
+
+
+# ----------- Hooks
+# The master builds the column store before any worker exists, so workers
+# never parse the CSV themselves and all map the same read-only files.
+def on_starting(server):
+    from dashboard.data import prepare_store
+
+    meta = prepare_store()
+    server.log.info("Column store ready: %s rows", f"{meta['rows']:,}")
+
+
+# With preload_app the master warms the figure cache once and every worker
+# inherits it on fork; otherwise each worker warms its own cache.
+def when_ready(server):
+    if preload_app:
+        warm(server)
+
+
+def post_worker_init(worker):
+    if not preload_app:
+        warm(worker)
+
+
+def warm(process):
+    from dashboard import config, warmup
+
+    if config.WARMUP != "off":
+        report = warmup.run()
+        process.log.info("Figure cache warmed: %d states in %.2fs", len(report["states"]), report["seconds"])
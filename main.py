@@ -3,11 +3,29 @@ import dash
 from dash import Dash, html, dcc, Input, Output
 import dash_bootstrap_components as dbc
 
+# Data Layer
+from dashboard import export, ingest, metrics, responses
+
 
 # -------------- Start The App ------------------ #
-app = Dash(__name__, use_pages=True, external_stylesheets=[dbc.themes.DARKLY])
+# Page layouts are functions that load data on first visit, so the
+# registry-wide validation layout (which would call them all) is skipped
+app = Dash(__name__, use_pages=True, suppress_callback_exceptions=True,
+           external_stylesheets=[dbc.themes.DARKLY])
 server = app.server
 
+# Accept New Invoice Batches Without Restarting
+ingest.init_app(server)
+
+# Per-Callback Timings & Payload Sizes On /metrics
+metrics.init_app(server)
+
+# Compressed, ETag-Keyed Callback & Layout Responses
+responses.init_app(server)
+
+# Filtered Transactions As Streamed CSV / Parquet Downloads
+export.init_app(server)
+
 # Nav Bar
 navbar = dbc.NavbarSimple(
     dbc.Nav(
@@ -29,5 +47,10 @@ app.layout = dbc.Container([
 ])
 
 if __name__ == "__main__":
+    # Precompute Every Dropdown State (Gunicorn Does This In Its Hooks)
+    from dashboard import config, warmup
+    if config.WARMUP != "off":
+        warmup.run()
+
     app.run_server(debug=True)
 
@@ -0,0 +1,245 @@
+# Importing Libraries
+import pandas as pd
+
+# Dash Components
+import dash
+from dash import Dash, html, dcc, Input, Output, callback
+import dash_bootstrap_components as dbc
+
+# Shared Data Layer
+from dashboard import figures, query
+from dashboard.cache import memoize
+from dashboard.metrics import instrument
+
+# Set Deafult Options
+pd.options.display.float_format = "{:,.2f}".format
+
+
+# -------------- Start The App ------------------ #
+dash.register_page(__name__, order=2)
+user_colors = ["#1879F4", "#FFED8F", "#2ED381", "#EC3636", "#32E0C4", "#FBA408"]
+
+# ---------------------- App Layout -----------------
+# Genders & Age Limits Come From The Per-Customer Table On First Visit
+def layout():
+    genders = query.customer_rollup("gender", "customers").index.tolist()
+    youngest, oldest = query.age_bounds()
+
+    return html.Div([
+        dbc.Row([
+            html.Br(),
+            html.H1("Customers", style={
+                "font-size": "30px",
+                "font-weight": "bold",
+                "font-family": "tahoma",
+                "color": "white",
+                "text-align": "center",
+                "margin-top": "20px",
+                "margin-bottom": "20px"
+            }),
+        ]),
+
+        # Drop Down Menu & Age Slider
+        dbc.Row([
+            dbc.Col([
+                dcc.Dropdown(
+                    id = "customers-gender-menu",
+                    options=[
+                        {
+                            "label": html.Span(["All Genders"], style={'color': 'tomato', 'font-size': 20}),
+                            "value": "all",
+                        },
+                    ] + [
+                        {"label": html.Span([gender], style={'color': '#9818D6', 'font-size': 20}), "value": gender} for gender in genders
+                    ],
+                    value = "all",
+                    multi=False,
+                    searchable=False,
+                    style={
+                        "color":"white",
+                        "border": "0px",
+                        "font-family": "tahoma",
+                        "margin-bottom": "15px",
+                        "background-color": "black"
+                    }
+                )
+            ], width = 4),
+
+            dbc.Col([
+                dcc.RangeSlider(
+                    id = "customers-age-range",
+                    min = youngest,
+                    max = oldest,
+                    step = 1,
+                    value = [youngest, oldest],
+                    marks = {age: str(age) for age in range(youngest - youngest % 10 + 10, oldest + 1, 10)},
+                    tooltip = {"placement": "bottom"},
+                )
+            ], width = 8),
+        ]),
+
+        # Cards
+        dbc.Row([
+            dbc.Col([
+                dbc.Card(
+                    dbc.CardBody([
+                        html.H3(id = 'customers-card'),
+                        html.H4("Customers", className="text-info")
+                    ], style={"background-color": "#000", "text-align": "center", "border":"1px solid #77ACF1", "border-radius": "10px"})
+                ),
+            ], ),
+
+            dbc.Col([
+                dbc.Card(
+                    dbc.CardBody([
+                        html.H3(id = 'purchases-per-customer-card'),
+                        html.H4("Purchases / Customer", className="text-info")
+                    ], style={"background-color": "#000", "text-align": "center", "border":"1px solid #77ACF1", "border-radius": "10px"})
+                ),
+            ], ),
+
+            dbc.Col([
+                dbc.Card(
+                    dbc.CardBody([
+                        html.H3(id = 'spend-per-customer-card'),
+                        html.H4("Spend / Customer", className="text-info")
+                    ], style={"background-color": "#000", "text-align": "center", "border":"1px solid #77ACF1", "border-radius": "10px"})
+                ),
+            ], ),
+
+        ], style={"margin-bottom": "20px"}),
+
+        # RFM Segments
+        dbc.Row([
+            dbc.Col([
+                dcc.Graph(id = "bar-chart-segments", style={"margin-bottom": "20px", "height": "550px"})
+            ], width = 12),
+        ], style={"border-bottom" : "1px solid darkcyan"}),
+
+        # Purchase Frequency & Age Bands
+        dbc.Row([
+            dbc.Col([
+                dcc.Graph(id = "bar-chart-frequency", style={"margin-top": "20px"})
+            ]),
+
+            dbc.Col([
+                dcc.Graph(id = "bar-chart-age-bands", style={"margin-top": "20px"})
+            ]),
+        ]),
+    ])
+
+
+# ------------------------------ Callbacks ------------------------------
+
+# Cards
+@callback(
+    Output(component_id= "customers-card", component_property="children"),
+    Output(component_id= "purchases-per-customer-card", component_property="children"),
+    Output(component_id= "spend-per-customer-card", component_property="children"),
+    Input(component_id= "customers-gender-menu", component_property="value"),
+    Input(component_id= "customers-age-range", component_property="value"),
+)
+@instrument
+@memoize
+def build_customer_cards(gender, ages):
+    totals = query.customer_totals(gender, ages)
+    customers = totals["customers"]
+
+    if customers == 0:
+        return "0", "-", "-"
+
+    return f"{customers:,.0f}", f"{totals['purchases'] / customers:,.2f}", f"{totals['monetary'] / customers:,.0f}"
+
+
+# Bar Chart Of RFM Segments
+figures.define("bar-chart-segments",
+    trace={
+        "type": "bar",
+        "textposition": "inside",
+        "texttemplate": "%{y:0.3s}",
+        "insidetextfont": {"family": "consolas", "size": 15},
+        "hovertemplate": "Segment=%{x}<br>Customers=%{y}<br>Spend in Liras=%{customdata:,.0f}<extra></extra>",
+    },
+    layout={"showlegend": False, "xaxis_title": "Segment", "yaxis_title": "Customers"},
+)
+
+
+@callback(
+    Output(component_id= "bar-chart-segments", component_property="figure"),
+    Input(component_id= "customers-gender-menu", component_property="value"),
+    Input(component_id= "customers-age-range", component_property="value"),
+)
+@instrument
+@memoize
+def build_segment_chart(gender, ages):
+    segments = query.customer_rollup("segment", ["customers", "monetary"], gender, ages)
+
+    return figures.figure("bar-chart-segments", [{
+        "x": segments.index.astype(str).tolist(),
+        "y": segments["customers"].to_numpy(),
+        "customdata": segments["monetary"].to_numpy(),
+        "marker": {"color": figures.cycle(user_colors, len(segments))},
+    }], title="Customers per RFM Segment (Recency, Frequency & Monetary Quintiles)")
+
+
+# Purchase Frequency Distribution
+figures.define("bar-chart-frequency",
+    trace={
+        "type": "bar",
+        "marker": {"color": user_colors[0]},
+        "textposition": "inside",
+        "texttemplate": "%{y:0.3s}",
+        "insidetextfont": {"family": "consolas", "size": 12},
+        "hovertemplate": "Purchases=%{x}<br>Customers=%{y}<extra></extra>",
+    },
+    layout={"xaxis_title": "Purchases", "yaxis_title": "Customers"},
+)
+
+
+@callback(
+    Output(component_id= "bar-chart-frequency", component_property="figure"),
+    Input(component_id= "customers-gender-menu", component_property="value"),
+    Input(component_id= "customers-age-range", component_property="value"),
+)
+@instrument
+@memoize
+def build_frequency_chart(gender, ages):
+    frequency = query.customer_rollup("frequency", "customers", gender, ages)
+
+    return figures.figure("bar-chart-frequency", [{
+        "x": frequency.index.astype(str).tolist(),
+        "y": frequency.to_numpy(),
+    }], title="Customers by Number of Purchases")
+
+
+# Spend per Age Band & Gender
+figures.define("bar-chart-age-bands",
+    trace={
+        "type": "bar",
+        "textposition": "inside",
+        "texttemplate": "%{y:0.3s}",
+        "insidetextfont": {"family": "consolas", "size": 12},
+    },
+    layout={"barmode": "group", "xaxis_title": "Age Band", "yaxis_title": "Spend in Liras", "legend_title": "Gender"},
+)
+
+
+@callback(
+    Output(component_id= "bar-chart-age-bands", component_property="figure"),
+    Input(component_id= "customers-gender-menu", component_property="value"),
+    Input(component_id= "customers-age-range", component_property="value"),
+)
+@instrument
+@memoize
+def build_age_band_chart(gender, ages):
+    age_bands = query.customer_rollup(["age_band", "gender"], "monetary", gender, ages).unstack("gender", fill_value=0)
+    bands = age_bands.index.astype(str).tolist()
+
+    # One Trace Per Gender
+    return figures.figure("bar-chart-age-bands", [{
+        "name": str(gender),
+        "x": bands,
+        "y": age_bands[gender].to_numpy(),
+        "marker": {"color": user_colors[i % len(user_colors)]},
+        "hovertemplate": f"Gender={gender}<br>Age Band=%{{x}}<br>Spend in Liras=%{{y}}<extra></extra>",
+    } for i, gender in enumerate(age_bands.columns)], title="Spend per Age Band")
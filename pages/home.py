@@ -1,381 +1,635 @@
 # Importing Libraries
 import numpy as np
 import pandas as pd
-import plotly.express as px
 
 # Dash Compnents
 import dash
-from dash import Dash, html, dcc, Input, Output, callback
+from dash import Dash, html, dcc, Input, Output, State, callback, clientside_callback, ClientsideFunction
 import dash_bootstrap_components as dbc
 
+# Shared Data Layer
+from dashboard import config, export, figures, query, timeline
+from dashboard.clientside import sales_aggregates, server_callback
+from dashboard.cache import memoize
+from dashboard.metrics import instrument
+
 # Set Deafult Options
 pd.options.display.float_format = "{:,.2f}".format
 
 
-# ----------- Data Cleaning & Casting
-# Load Data
-df = pd.read_csv("customer_shopping_data.csv")
-# Casting Data Type of Date
-df["invoice_date"] = pd.to_datetime(df["invoice_date"], format="%d/%m/%Y")
-
-# Add Another Column of Total Sales In Lira
-df["total_price"] = df["quantity"] * df["price"]
-
-# Drop Unnecessary Column
-df.drop(columns="invoice_no", inplace=True)
-
-# Rearange The Order Of Columns
-df = df[["customer_id", "age", "gender", "invoice_date",
-         "category", "shopping_mall", "payment_method",
-         "quantity", "price", "total_price"]].copy()
-
-
 # -------------- Start The App ------------------ #
-dash.register_page(__name__, path="/")
+dash.register_page(__name__, path="/", order=0)
 
 user_colors = ["#1879F4", "#FFED8F", "#2ED381", "#EC3636", "#32E0C4", "#FBA408"]
+month_as_names = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+# Clickable Charts: The Dimension They Filter And Where A Click Holds Its Value
+click_dimensions = {
+    "pie-chart-gender": ("gender", "label"),
+    "barh-chart-category": ("category", "y"),
+    "bar-chart-payment": ("payment_method", "x"),
+    "bar-chart-shopping-mall": ("shopping_mall", "y"),
+    "line-chart-month": ("month", "x"),
+}
+dimension_names = {"gender": "Gender", "category": "Category", "payment_method": "Payment",
+                   "shopping_mall": "Mall", "month": "Month"}
 
 # ---------------------- App Layout -----------------
-layout = html.Div([
-    dbc.Row([
-        html.Br(),
-        html.H1("Sales", style={
-            "font-size": "30px",
-            "font-weight": "bold",
-            "font-family": "tahoma",
-            "color": "white",
-            "text-align": "center",
-            "margin-top": "20px",
-            "margin-bottom": "20px"
-        }),
-    ]),
-
-    # Drop Down Menu
-    dbc.Row([
-        html.Br(),
-        dcc.Dropdown(
-            id = "year-menu",
-            options=[
-                {
-                    "label": html.Span(["All Years"], style={'color': 'tomato', 'font-size': 20}),
-                    "value": "all",
-                },
-                {
-                    "label": html.Span([2021], style={'color': '#9818D6', 'font-size': 20}),
-                    "value": 2021,
-                },
-                {
-                    "label": html.Span([2022],  style={'color': '#9818D6', 'font-size': 20}),
-                    "value": 2022,
-                },
-                {
-                    "label": html.Span([2023],  style={'color': '#9818D6', 'font-size': 20}),
-                    "value": 2023,
-                },
-            ],
-            value = "all",
-            multi=False,
-            searchable=False,
-            style={
-                "color":"white",
-                "border": "0px",
+# Built On Each Visit, So Importing The Page Never Touches The Data
+def layout():
+    return html.Div([
+        # Aggregates For Client-Side Mode (Filled Once Per Page Load)
+        dcc.Store(id="sales-aggregates"),
+
+        dbc.Row([
+            html.Br(),
+            html.H1("Sales", style={
+                "font-size": "30px",
+                "font-weight": "bold",
                 "font-family": "tahoma",
-                "margin-bottom": "15px",
-                "background-color": "black"
-
-            }
-        )
-    ]),
-
-    # Cards
-    dbc.Row([
-        dbc.Col([
-            dbc.Card(
-                dbc.CardBody([
-                    html.H3(f"{df['total_price'].sum():,.0f}", id = 'total-sales-card'),
-                    html.H4("Sales", className="text-info")
-                ], style={"background-color": "#000", "text-align": "center", "border":"1px solid #77ACF1", "border-radius": "10px"})
-            ),
-        ], ),
-
-        dbc.Col([
-            dbc.Card(
-                dbc.CardBody([
-                    html.H3(f"{df['quantity'].sum():,.0f}", id='sold-quantity-card'),
-                    html.H4("Volumes", className="text-info")
-                ], style={"background-color": "#000", "text-align": "center", "border":"1px solid #77ACF1", "border-radius": "10px"})
-            ),
-        ], ),
-
-        dbc.Col([
-            dbc.Card(
-                dbc.CardBody([
-                    html.H3(children=f"{df['customer_id'].nunique():,.0f}", id='total-customers-card'),
-                    html.H4("Customers", className="text-info")
-                ],style={"background-color": "#000", "text-align": "center", "border":"1px solid #77ACF1", "border-radius": "10px"})
-            ),
-        ], )
-
-    ], style={"margin-bottom": "20px"}),
-
-
-    # Line Chart of Months
-    dbc.Row([
-        dbc.Col([
-            dcc.Graph(id = "line-chart-month", style={"margin-bottom": "20px", "height":"600px"})
-        ], width = 12),
-    ], style={"border-bottom" : "1px solid darkcyan"}),
-
-    # Pie Chart & Bar Horizontal Chart
-    dbc.Row([
-        dbc.Col([
-            dcc.Graph(id = "pie-chart-gender", style={"margin-top": "20px"})
+                "color": "white",
+                "text-align": "center",
+                "margin-top": "20px",
+                "margin-bottom": "20px"
+            }),
         ]),
 
-        dbc.Col([
-            dcc.Graph(id = "barh-chart-category", style={"margin-top": "20px"})
+        # Drop Down Menu
+        dbc.Row([
+            html.Br(),
+            dcc.Dropdown(
+                id = "year-menu",
+                options=[
+                    {
+                        "label": html.Span(["All Years"], style={'color': 'tomato', 'font-size': 20}),
+                        "value": "all",
+                    },
+                ] + [
+                    # One Entry Per Year Present In The Data
+                    {
+                        "label": html.Span([year], style={'color': '#9818D6', 'font-size': 20}),
+                        "value": year,
+                    } for year in query.years()
+                ],
+                value = "all",
+                multi=False,
+                searchable=False,
+                style={
+                    "color":"white",
+                    "border": "0px",
+                    "font-family": "tahoma",
+                    "margin-bottom": "15px",
+                    "background-color": "black"
+
+                }
+            )
         ]),
 
-    ]),
+        # Chart Selections: Clicking A Slice, Bar Or Point Filters The Other Charts
+        # (Server Only: Hidden In Client-Side Mode, Where Clicks Do Nothing)
+        dcc.Store(id="sales-selections", data=[]),
+        dbc.Row([
+            dbc.Col([
+                html.Div(id="sales-selections-summary", style={"color": "white", "font-family": "tahoma"})
+            ], width=6, style={"visibility": "hidden"} if config.CLIENTSIDE else {}),
+
+            # Download The Transactions Behind The Charts
+            dbc.Col([
+                html.A("Download CSV", id="export-csv", href=export.export_url("csv"), download="",
+                       className="btn btn-outline-info btn-sm", style={"margin-right": "10px"}),
+                html.A("Download Parquet", id="export-parquet", href=export.export_url("parquet"), download="",
+                       className="btn btn-outline-info btn-sm", style={} if export.PARQUET else {"display": "none"}),
+            ], width=4, style={"text-align": "right"}),
+
+            dbc.Col([
+                dbc.Button("Clear Selections", id="clear-selections", color="info", outline=True, size="sm")
+            ], width=2, style={"text-align": "right", "display": "none"} if config.CLIENTSIDE else {"text-align": "right"}),
+        ], style={"margin-bottom": "15px"}),
+
+        # Cards
+        dbc.Row([
+            dbc.Col([
+                dbc.Card(
+                    dbc.CardBody([
+                        html.H3(f"{query.range_total('total_price'):,.0f}", id = 'total-sales-card'),
+                        html.H4("Sales", className="text-info")
+                    ], style={"background-color": "#000", "text-align": "center", "border":"1px solid #77ACF1", "border-radius": "10px"})
+                ),
+            ], ),
+
+            dbc.Col([
+                dbc.Card(
+                    dbc.CardBody([
+                        html.H3(f"{query.range_total('quantity'):,.0f}", id='sold-quantity-card'),
+                        html.H4("Volumes", className="text-info")
+                    ], style={"background-color": "#000", "text-align": "center", "border":"1px solid #77ACF1", "border-radius": "10px"})
+                ),
+            ], ),
+
+            dbc.Col([
+                dbc.Card(
+                    dbc.CardBody([
+                        html.H3(children=f"{query.range_customers():,.0f}", id='total-customers-card'),
+                        html.H4("Customers", className="text-info")
+                    ],style={"background-color": "#000", "text-align": "center", "border":"1px solid #77ACF1", "border-radius": "10px"})
+                ),
+            ], )
+
+        ], style={"margin-bottom": "20px"}),
+
+
+        # Line Chart of Months
+        dbc.Row([
+            dbc.Col([
+                dcc.Graph(id = "line-chart-month", style={"margin-bottom": "20px", "height":"600px"})
+            ], width = 12),
+        ], style={"border-bottom" : "1px solid darkcyan"}),
+
+        # Zoomable Daily Sales Timeline
+        dbc.Row([
+            dbc.Col([
+                dcc.Graph(id = "timeline-chart", style={"margin-top": "20px", "margin-bottom": "20px", "height":"500px"})
+            ], width = 12),
+        ], style={"border-bottom" : "1px solid darkcyan"}),
+
+        # Pie Chart & Bar Horizontal Chart
+        dbc.Row([
+            dbc.Col([
+                dcc.Graph(id = "pie-chart-gender", style={"margin-top": "20px"})
+            ]),
+
+            dbc.Col([
+                dcc.Graph(id = "barh-chart-category", style={"margin-top": "20px"})
+            ]),
 
+        ]),
 
-    dbc.Row([
-        dbc.Col([
-            dcc.Graph(id="bar-chart-payment", style={"margin-top": "20px"})
+
+        dbc.Row([
+            dbc.Col([
+                dcc.Graph(id="bar-chart-payment", style={"margin-top": "20px"})
+            ]),
+
+            dbc.Col([
+                dcc.Graph(id=  "bar-chart-shopping-mall", style={"margin-top": "20px"})
+            ]),
         ]),
 
-        dbc.Col([
-            dcc.Graph(id=  "bar-chart-shopping-mall", style={"margin-top": "20px"})
+        # Price & Age Distributions (Merged From Per Mall/Category/Year Sketches)
+        dbc.Row([
+            dbc.Col([
+                dcc.Graph(id = "box-chart-price", style={"margin-top": "20px"})
+            ]),
+
+            dbc.Col([
+                dcc.Graph(id = "histogram-age", style={"margin-top": "20px"})
+            ]),
         ]),
-    ]),
 
-])
+    ])
 
 
 # ------------------------------ Callbacks ------------------------------
 # ========== Importnat Part That Connects Graphs With Other Components ===========
 
-# Cards Chart
-@callback(
-    Output(component_id= "total-sales-card", component_property="children"),
-    Output(component_id= "sold-quantity-card", component_property="children"),
-    Output(component_id= "total-customers-card", component_property="children"),
-    Input(component_id= "year-menu", component_property="value"),
+# Clicks Toggle "dimension:value" Selections; A Year Bar Picks That Year Instead
+@server_callback(
+    Output(component_id= "sales-selections", component_property="data"),
+    Output(component_id= "year-menu", component_property="value"),
+    [Input(component_id= chart, component_property="clickData") for chart in click_dimensions],
+    Input(component_id= "clear-selections", component_property="n_clicks"),
+    State(component_id= "sales-selections", component_property="data"),
+    prevent_initial_call=True,
 )
-def build_card(option):
-    if option == "all":
-        total_sales = df["total_price"].sum()
+@instrument
+def select_sales(*args):
+    selections = list(args[-1] or [])
+    chart = dash.ctx.triggered_id
 
-        total_sold_quantity = df["quantity"].sum()
+    if chart == "clear-selections" or chart is None:
+        return [], dash.no_update
 
-        total_number_cutomers = df["customer_id"].nunique()
+    dimension, key = click_dimensions[chart]
+    value = dash.ctx.triggered[0]["value"]["points"][0][key]
 
-        return f"{total_sales:,.0f}", f"{total_sold_quantity:,.0f}", f"{total_number_cutomers:,.0f}"
+    if dimension == "month":
+        if value not in month_as_names:
+            return dash.no_update, int(value)
+        value = month_as_names.index(value) + 1
 
+    selection = f"{dimension}:{value}"
+    if selection in selections:
+        selections.remove(selection)
     else:
+        selections.append(selection)
 
-        filt = df["invoice_date"].dt.year == option
+    return sorted(selections), dash.no_update
 
-        df_filterd = df[filt]
 
-        total_sales = df_filterd["total_price"].sum()
+@server_callback(
+    Output(component_id= "sales-selections-summary", component_property="children"),
+    Input(component_id= "sales-selections", component_property="data"),
+)
+@instrument
+def show_selections(selections):
+    if not selections:
+        return "Click a slice, bar or month to filter the other charts"
+
+    chosen = {}
+    for dimension, value in selected_values(selections).items():
+        chosen[dimension_names[dimension]] = ", ".join(value)
+    return " | ".join(f"{name}: {values}" for name, values in chosen.items())
+
+
+# {dimension: [labels as the charts show them]}
+def selected_values(selections):
+    chosen = {}
+    for selection in selections or []:
+        dimension, value = selection.split(":", 1)
+        chosen.setdefault(dimension, []).append(month_as_names[int(value) - 1] if dimension == "month" else value)
+    return chosen
+
+
+# Download Links Follow The Year & The Chart Selections (Built In The Browser)
+clientside_callback(
+    ClientsideFunction(namespace="sales", function_name="exportLinks"),
+    Output(component_id= "export-csv", component_property="href"),
+    Output(component_id= "export-parquet", component_property="href"),
+    Input(component_id= "year-menu", component_property="value"),
+    Input(component_id= "sales-selections", component_property="data"),
+)
 
-        total_sold_quantity = df_filterd["quantity"].sum()
 
-        total_number_cutomers = df_filterd["customer_id"].nunique()
+# Dims What Is Not Selected In A Chart's Own Dimension
+def highlight(fig, selections, dimension, key):
+    chosen = set(selected_values(selections).get(dimension, []))
+    if not chosen:
+        return fig
 
+    for trace in fig["data"]:
+        if key == "label":
+            trace["pull"] = [0.1 if str(label) in chosen else 0 for label in trace["labels"]]
+        else:
+            trace["selectedpoints"] = [i for i, label in enumerate(trace[key]) if str(label) in chosen]
+    return fig
 
-        return f"{total_sales:,.0f}", f"{total_sold_quantity:,.0f}", f"{total_number_cutomers:,.0f}"
 
+# Cards Chart (Prefix Sums Over The Sorted Date Index, For The Days Of The Year Option)
+@server_callback(
+    Output(component_id= "total-sales-card", component_property="children"),
+    Output(component_id= "sold-quantity-card", component_property="children"),
+    Output(component_id= "total-customers-card", component_property="children"),
+    Input(component_id= "year-menu", component_property="value"),
+)
+@instrument
+@memoize
+def build_card(option):
+    start_date, end_date = query.option_range(option)
 
-# Line Chart
-@callback(
+    total_sales = query.range_total("total_price", start_date, end_date)
+
+    total_sold_quantity = query.range_total("quantity", start_date, end_date)
+
+    total_number_cutomers = query.range_customers(start_date, end_date)
+
+    return f"{total_sales:,.0f}", f"{total_sold_quantity:,.0f}", f"{total_number_cutomers:,.0f}"
+
+
+# Line Chart (Bars Per Year For All Years)
+figures.define("line-chart-month-years",
+    trace={
+        "type": "bar",
+        "textposition": "inside",
+        "texttemplate": "%{y:0.4s}",
+        "insidetextfont": {"family": "consolas", "size": 20},
+        "hovertemplate": "Year=%{x}<br>Total Price in Liras=%{y}<extra></extra>",
+    },
+    layout={"showlegend": False, "xaxis_title": "Year", "yaxis_title": "Total Price in Liras"},
+)
+
+figures.define("line-chart-month",
+    trace={"type": "scatter", "mode": "lines+markers", "line": {"color": "#636efa"}},
+    layout={"showlegend": False, "yaxis_title": "Total Price in Liras"},
+)
+
+
+@server_callback(
     Output(component_id= "line-chart-month", component_property="figure"),
     Input(component_id= "year-menu", component_property="value"),
+    Input(component_id= "sales-selections", component_property="data"),
 )
-def build_line_chart(option):
-    month_as_names = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-
+@instrument
+@memoize
+def build_line_chart(option, selections=()):
     if option == "all":
-        group_year = df.groupby(df["invoice_date"].dt.year)["total_price"].sum()
-        group_year.index = ["2021", "2022", "2023"]
-
-        fig = px.bar(group_year,
-                     x = group_year.index,
-                     y = group_year,
-                     template="plotly_dark",
-                     text_auto="0.4s",
-                     color = group_year.index,
-                     color_discrete_sequence=["#1879F4", "#1879F4", 'darkcyan'],
-                     title=f"Total Sales Per Year (Geoupped Match Months Together in Each Year)",
-                     labels={"index": f"Year", "value": "Total Price in Liras"}, )
-
-        fig.update_layout(showlegend=False)
-        fig.update_traces(
-            textposition="inside",
-            insidetextfont={
-                "family": "consolas",
-                "size": 20,
-            }
-        )
+        group_year = query.crossfilter_rollup("year", "total_price", selections=selections)
 
-        return fig
+        return figures.figure("line-chart-month-years", [{
+            "x": group_year.index.astype(str).tolist(),
+            "y": group_year.to_numpy(),
+            "marker": {"color": figures.cycle(["#1879F4", "#1879F4", 'darkcyan'], len(group_year))},
+        }], title=f"Total Sales Per Year (Geoupped Match Months Together in Each Year)")
 
     else:
 
-        filt = df["invoice_date"].dt.year == option
+        df_filterd_group = query.crossfilter_rollup("month", "total_price", option, selections)
+
+        fig = figures.figure("line-chart-month", [{
+            "x": [month_as_names[month - 1] for month in df_filterd_group.index],
+            "y": df_filterd_group.to_numpy(),
+            "hovertemplate": f"Months of {option}=%{{x}}<br>Total Price in Liras=%{{y}}<extra></extra>",
+        }], title= f"Total Sales Per Month via Year {option}", xaxis={"title": {"text": f"Months of {option}"}})
+
+        return highlight(fig, selections, "month", "x")
+
 
-        df_filterd = df[filt]
-        df_filterd_group = df_filterd.groupby(df_filterd["invoice_date"].dt.month)["total_price"].sum()
-        df_filterd_group.index = month_as_names[0 : len(df_filterd_group)]
 
-        fig = px.line(df_filterd_group,
-                      markers=True,
-                      template= "plotly_dark",
-                      title= f"Total Sales Per Month via Year {option}",
-                      labels={"index": f"Months of {option}", "value": "Total Price in Liras"}, )
+# Sales Timeline: Zooming Or Panning Re-Samples The Visible Range On The Server
+figures.define("timeline-chart",
+    trace={
+        "type": "scatter",
+        "mode": "lines",
+        "line": {"color": "#636efa"},
+        "hovertemplate": "Date=%{x}<br>Total Price in Liras=%{y}<extra></extra>",
+    },
+    # Keep The User's View Across Updates
+    layout={"showlegend": False, "uirevision": "timeline", "xaxis_title": "Date", "yaxis_title": "Total Price in Liras"},
+)
+
 
-        fig.update_layout(showlegend=False)
+@callback(
+    Output(component_id= "timeline-chart", component_property="figure"),
+    Input(component_id= "timeline-chart", component_property="relayoutData"),
+)
+@instrument
+def build_timeline(relayout):
+    relayout = relayout or {}
+
+    if "xaxis.range[0]" in relayout:
+        start, end = relayout["xaxis.range[0]"], relayout["xaxis.range[1]"]
+    elif "xaxis.range" in relayout:
+        start, end = relayout["xaxis.range"]
+    elif relayout.get("xaxis.autorange") or not relayout:
+        start, end = None, None
+    else:
+        # Y-Axis Zoom, Drag Mode, ... Leave The Figure Alone
+        return dash.no_update
 
+    fig = build_timeline_figure(start and str(start)[:10], end and str(end)[:10])
+    if not relayout:
         return fig
 
+    # The Browser Already Has The Layout & Its Zoom: Only Send The New Points
+    patch = dash.Patch()
+    patch["data"][0]["x"] = fig["data"][0]["x"]
+    patch["data"][0]["y"] = fig["data"][0]["y"]
+    patch["layout"]["title"]["text"] = fig["layout"]["title"]["text"]
+    return patch
+
+
+@memoize
+def build_timeline_figure(start, end):
+    level, days, sales = timeline.window(start, end)
+
+    return figures.figure("timeline-chart", [{"x": np.datetime_as_string(days), "y": sales}],
+                          title=f"{level} Sales ({len(days):,} points, zoom in for more detail)",
+                          xaxis={"range": [start, end]} if start and end else {})
 
 
 # Pie Chart & bar Horizontal chart
-@callback(
+figures.define("pie-chart-gender",
+    trace={
+        "type": "pie",
+        "hole": 0.50,
+        "textposition": "inside",
+        "insidetextfont": {"family": "consolas", "size": 20},
+        "hovertemplate": "Gender=%{label}<br>Total Sales=%{value}<extra></extra>",
+    },
+    layout={"piecolorway": user_colors},
+)
+
+figures.define("barh-chart-category",
+    trace={
+        "type": "bar",
+        "orientation": "h",
+        "marker": {"color": user_colors[0]},
+        "textposition": "inside",
+        "texttemplate": "%{x:0.3s}",
+        "insidetextfont": {"family": "consolas", "size": 15},
+        "hovertemplate": "Quantity Sold=%{x}<br>Category=%{y}<extra></extra>",
+    },
+    layout={"showlegend": False, "xaxis_title": "Quantity Sold", "yaxis_title": "Category"},
+)
+
+
+@server_callback(
     Output(component_id= "pie-chart-gender", component_property="figure"),
     Output(component_id= "barh-chart-category", component_property="figure"),
     Input(component_id= "year-menu", component_property="value"),
+    Input(component_id= "sales-selections", component_property="data"),
 )
-def build_pie_bar(option):
-    if option == "all":
-        group_gender = df.groupby(df["gender"])["total_price"].sum()
-        group_category = df.groupby(df["category"])["quantity"].sum().sort_values()
+@instrument
+@memoize
+def build_pie_bar(option, selections=()):
+    group_gender = query.crossfilter_rollup("gender", "total_price", option, selections)
+    group_category = query.crossfilter_rollup("category", "quantity", option, selections).sort_values()
 
+    if option == "all":
         msg_title_gender =  f"Total Sales Per Gender"
         msg_title_category = f"Sold Quantity Per Category"
 
     else:
-        filt = df["invoice_date"].dt.year == option
-        df_filterd = df[filt]
-        group_gender = df_filterd.groupby(df_filterd["gender"])["total_price"].sum()
-        group_category = df_filterd.groupby(df_filterd["category"])["quantity"].sum().sort_values()
         msg_title_gender = f"Total Sales Per Gender via Year {option}"
         msg_title_category = f"Sold Quantity Per Category via Year {option}"
 
 
     # Pie Chart For Gender
-    pie_fig = px.pie(values=group_gender, names = group_gender.index,
-                    template= "plotly_dark",
-                    title=msg_title_gender,
-                    color_discrete_sequence= user_colors,
-                    hole=0.50
-                 )
-
-    pie_fig.update_traces(
-        textposition="inside",
-        insidetextfont={
-            "family": "consolas",
-            "size": 20,
-        }
-    )
+    pie_fig = figures.figure("pie-chart-gender", [{
+        "labels": group_gender.index.astype(str).tolist(),
+        "values": group_gender.to_numpy(),
+    }], title=msg_title_gender)
 
     # --------------------------------------
 
     # Bar Chart For Category
-    bar_fig = px.bar(group_category,
-                    template="plotly_dark",
-                    title=msg_title_category,
-                    orientation="h",
-                    text_auto="0.3s",
-                    color_discrete_sequence=user_colors,
-                    labels={"category": "Category", "value":"Quantity Sold"}
-                     )
-
-    bar_fig.update_traces(
-        textposition="inside",
-        insidetextfont={
-            "family": "consolas",
-            "size": 15,
-        }
-    )
+    bar_fig = figures.figure("barh-chart-category", [{
+        "x": group_category.to_numpy(),
+        "y": group_category.index.astype(str).tolist(),
+    }], title=msg_title_category)
 
-    bar_fig.update_layout(showlegend=False)
-
-    return pie_fig, bar_fig
+    return highlight(pie_fig, selections, "gender", "label"), highlight(bar_fig, selections, "category", "y")
 
 
 
 # Bar Chart
-@callback(
+figures.define("bar-chart-payment",
+    trace={
+        "type": "bar",
+        "textposition": "inside",
+        "texttemplate": "%{y:0.4s}",
+        "insidetextfont": {"family": "consolas", "size": 15},
+        "hovertemplate": "Payment Method=%{x}<br>Frequncey=%{y}<extra></extra>",
+    },
+    layout={"showlegend": False, "xaxis_title": "Payment Method", "yaxis_title": "Frequncey"},
+)
+
+figures.define("bar-chart-shopping-mall",
+    trace={
+        "type": "bar",
+        "orientation": "h",
+        "marker": {"color": "#1879F4"},
+        "textposition": "inside",
+        "texttemplate": "%{x:0.3s}",
+        "insidetextfont": {"family": "consolas", "size": 15},
+        "hovertemplate": "Total Sales In Liras=%{x}<br>Shopping Mall=%{y}<extra></extra>",
+    },
+    layout={"showlegend": False, "xaxis_title": "Total Sales In Liras", "yaxis_title": "Shopping Mall"},
+)
+
+
+@server_callback(
     Output(component_id= "bar-chart-payment", component_property="figure"),
     Output(component_id= "bar-chart-shopping-mall", component_property="figure"),
     Input(component_id= "year-menu", component_property="value"),
+    Input(component_id= "sales-selections", component_property="data"),
 )
-def build_pie_bar(option):
+@instrument
+@memoize
+def build_bar_charts(option, selections=()):
+    payment_methods = query.crossfilter_rollup("payment_method", "count", option, selections).sort_values(ascending=False)
+    shopping_malls = query.crossfilter_rollup("shopping_mall", "total_price", option, selections).sort_values(ascending=False)
+
     if option == "all":
-        payment_methods = df["payment_method"].value_counts()
-        shopping_malls = df.groupby("shopping_mall")["total_price"].sum().sort_values(ascending=False)
         msg_title_payment = f"Popularity of Each Payment Methods"
         msg_title_shopping_mall = f"Total Sales For Each Shopping Malls"
 
     else:
-        filt = df["invoice_date"].dt.year == option
-        df_filterd = df[filt]
-        payment_methods = df_filterd["payment_method"].value_counts()
-        shopping_malls = df_filterd.groupby("shopping_mall")["total_price"].sum().sort_values(ascending=False)
-
         msg_title_payment = f"Popularity of Payment Methods via Year {option}"
         msg_title_shopping_mall = f"Total Sales For Shopping Malls In Year {option}"
 
 
     # Bar Chart For Category
-    bar_fig = px.bar(payment_methods,
-                     template="plotly_dark",
-                     title=msg_title_payment,
-                     text_auto="0.4s",
-                     color=payment_methods.index,
-                     color_discrete_sequence=user_colors,
-                     labels={"payment_method": "Payment Method", "value":"Frequncey"}
-                     )
-
-    bar_fig.update_traces(
-        textposition="inside",
-        insidetextfont={
-            "family": "consolas",
-            "size": 15,
-        }
-    )
-
-    bar_fig.update_layout(showlegend=False)
+    bar_fig = figures.figure("bar-chart-payment", [{
+        "x": payment_methods.index.astype(str).tolist(),
+        "y": payment_methods.to_numpy(),
+        "marker": {"color": figures.cycle(user_colors, len(payment_methods))},
+    }], title=msg_title_payment)
 
     # =================================
     # Bar Chart For Category
-    bar_horiz_fig = px.bar(shopping_malls,
-                     template="plotly_dark",
-                     title=msg_title_shopping_mall,
-                     text_auto="0.3s",
-                     orientation="h",
-                     color=shopping_malls.index,
-                     color_discrete_sequence= ["#1879F4"],
-                     labels={"shopping_mall": "Shopping Mall", "value": "Total Sales In Liras"},
-                     )
-
-    bar_horiz_fig.update_traces(
-        textposition="inside",
-        insidetextfont={
-            "family": "consolas",
-            "size": 15,
-        },
+    bar_horiz_fig = figures.figure("bar-chart-shopping-mall", [{
+        "x": shopping_malls.to_numpy(),
+        "y": shopping_malls.index.astype(str).tolist(),
+    }], title=msg_title_shopping_mall)
 
-    )
+    return  highlight(bar_fig, selections, "payment_method", "x"), highlight(bar_horiz_fig, selections, "shopping_mall", "y")
 
-    bar_horiz_fig.update_layout(showlegend=False)
 
 
+# Price Percentiles per Category & Age Histogram
+figures.define("box-chart-price",
+    trace={"type": "box", "marker": {"color": user_colors[0]}},
+    layout={"showlegend": False, "xaxis_title": "Category", "yaxis_title": "Price in Liras", "yaxis_type": "log"},
+)
+
+figures.define("histogram-age",
+    trace={
+        "type": "bar",
+        "marker": {"color": user_colors[2]},
+        "hovertemplate": "Age=%{x}<br>Invoices=%{y}<extra></extra>",
+    },
+    layout={"bargap": 0.05, "xaxis_title": "Age", "yaxis_title": "Invoices"},
+)
+
+
+@server_callback(
+    Output(component_id= "box-chart-price", component_property="figure"),
+    Output(component_id= "histogram-age", component_property="figure"),
+    Input(component_id= "year-menu", component_property="value"),
+)
+@instrument
+@memoize
+def build_distributions(option):
+    price_quantiles = query.price_quantiles([0.05, 0.25, 0.5, 0.75, 0.95], option)
+    ages = query.age_histogram(option)
+    median_age = ages.index[np.searchsorted(ages.cumsum().to_numpy(), ages.sum() / 2)]
+
+    if option == "all":
+        msg_title_price = f"Price Percentiles Per Category (5-25-50-75-95%)"
+        msg_title_age = f"Invoices Per Customer Age (Median {median_age})"
+
+    else:
+        msg_title_price = f"Price Percentiles Per Category via Year {option}"
+        msg_title_age = f"Invoices Per Customer Age via Year {option} (Median {median_age})"
+
 
+    # Box Chart From Precomputed Percentiles (Whiskers At 5% & 95%)
+    box_fig = figures.figure("box-chart-price", [{
+        "x": price_quantiles.index.astype(str).tolist(),
+        "lowerfence": price_quantiles[0.05].to_numpy(),
+        "q1": price_quantiles[0.25].to_numpy(),
+        "median": price_quantiles[0.5].to_numpy(),
+        "q3": price_quantiles[0.75].to_numpy(),
+        "upperfence": price_quantiles[0.95].to_numpy(),
+    }], title=msg_title_price)
 
-    return  bar_fig, bar_horiz_fig
+    # --------------------------------------
+
+    # Histogram Of Ages (One Bar Per Year Of Age)
+    age_fig = figures.figure("histogram-age", [{"x": ages.index.to_numpy(), "y": ages.to_numpy()}], title=msg_title_age)
+
+    return box_fig, age_fig
+
+
+# ------------------------------ Client-Side Mode ------------------------------
+# One server round-trip ships the aggregates; year changes are handled by
+# assets/sales.js in the browser.
+if config.CLIENTSIDE:
+    @callback(
+        Output(component_id= "sales-aggregates", component_property="data"),
+        Input(component_id= "sales-aggregates", component_property="id"),
+    )
+    @instrument
+    @memoize
+    def load_sales_aggregates(_):
+        return sales_aggregates()
+
+    clientside_callback(
+        ClientsideFunction(namespace="sales", function_name="cards"),
+        Output(component_id= "total-sales-card", component_property="children"),
+        Output(component_id= "sold-quantity-card", component_property="children"),
+        Output(component_id= "total-customers-card", component_property="children"),
+        Input(component_id= "year-menu", component_property="value"),
+        Input(component_id= "sales-aggregates", component_property="data"),
+    )
+
+    clientside_callback(
+        ClientsideFunction(namespace="sales", function_name="line"),
+        Output(component_id= "line-chart-month", component_property="figure"),
+        Input(component_id= "year-menu", component_property="value"),
+        Input(component_id= "sales-aggregates", component_property="data"),
+    )
 
+    clientside_callback(
+        ClientsideFunction(namespace="sales", function_name="pieBar"),
+        Output(component_id= "pie-chart-gender", component_property="figure"),
+        Output(component_id= "barh-chart-category", component_property="figure"),
+        Input(component_id= "year-menu", component_property="value"),
+        Input(component_id= "sales-aggregates", component_property="data"),
+    )
 
+    clientside_callback(
+        ClientsideFunction(namespace="sales", function_name="distributions"),
+        Output(component_id= "box-chart-price", component_property="figure"),
+        Output(component_id= "histogram-age", component_property="figure"),
+        Input(component_id= "year-menu", component_property="value"),
+        Input(component_id= "sales-aggregates", component_property="data"),
+    )
 
+    clientside_callback(
+        ClientsideFunction(namespace="sales", function_name="bars"),
+        Output(component_id= "bar-chart-payment", component_property="figure"),
+        Output(component_id= "bar-chart-shopping-mall", component_property="figure"),
+        Input(component_id= "year-menu", component_property="value"),
+        Input(component_id= "sales-aggregates", component_property="data"),
+    )
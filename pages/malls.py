@@ -1,142 +1,153 @@
 # Importing Libraries
 import numpy as np
 import pandas as pd
-import plotly.express as px
 
 # Dash Components
 import dash
 from dash import Dash, html, dcc, Input, Output, callback
 import dash_bootstrap_components as dbc
 
+# Shared Data Layer
+from dashboard import export, figures, query
+from dashboard.cache import memoize
+from dashboard.metrics import instrument
+
 # Set Deafult Options
 pd.options.display.float_format = "{:,.2f}".format
 
 
-# ----------- Data Cleaning & Casting ----------------
-# Load Data
-df = pd.read_csv("customer_shopping_data.csv")
-
-# Casting Data Type of Date
-df["invoice_date"] = pd.to_datetime(df["invoice_date"], format="%d/%m/%Y")
-
-# Add Another Column of Total Sales In Lira
-df["total_price"] = df["quantity"] * df["price"]
-
-# Drop Unnecessary Column
-df.drop(columns="invoice_no", inplace=True)
-
-# Rearange The Order Of Columns
-df = df[["customer_id", "age", "gender", "invoice_date",
-         "category", "shopping_mall", "payment_method",
-         "quantity", "price", "total_price"]].copy()
-
-
 # -------------- Start The App ------------------ #
-dash.register_page(__name__)
+dash.register_page(__name__, order=1)
 user_colors = ["#1879F4", "#FFED8F", "#2ED381", "#EC3636", "#32E0C4", "#FBA408"]
-df_c = df.copy()
-
-drop_down_options = []
-drop_down_options.extend(df["shopping_mall"].unique().tolist())
 
 # ---------------------- App Layout -----------------
-layout = html.Div([
-    dbc.Row([
-        html.Br(),
-        html.H1("Shopping Malls", style={
-            "font-size": "30px",
-            "font-weight": "bold",
-            "font-family": "tahoma",
-            "color": "white",
-            "text-align": "center",
-            "margin-top": "20px",
-            "margin-bottom": "20px"
-        }),
-    ]),
-
-    # Drop Down Menu
-    dbc.Row([
-        html.Br(),
-        dcc.Dropdown(
-            id = "malls-menu",
-            options=[
-
-                {"label": html.Span([i], style={'color': 'violet', 'font-size': 20}), "value": i,} for i in  drop_down_options
-            ],
-            value = [],
-            multi=True,
-            searchable=True,
-            placeholder= "Selct a Shopping Mall",
-            clearable=True,
-            style={
-                "color":"white",
-                "border": "0px",
+# The Mall List Comes From The Cube When The Page Is First Visited
+def layout():
+    drop_down_options = query.malls()
+
+    return html.Div([
+        dbc.Row([
+            html.Br(),
+            html.H1("Shopping Malls", style={
+                "font-size": "30px",
+                "font-weight": "bold",
                 "font-family": "tahoma",
-                "margin-bottom": "15px",
-                "background-color": "black"
-            },
-        )
-    ]),
-
-    # Card
-    dbc.Row([
-        dbc.Col([
-            dbc.Card(
-                dbc.CardBody([
-                    html.H6("Top Mall in Sales", className="text-info"),
-                    html.H3(f'', id='max-sales-mall')
-                ], style={"background-color": "#000", "text-align": "center", "border":"1px solid darkblue", "border-radius": "10px"})
-            ),
-        ], ),
-
-        dbc.Col([
-            dbc.Card(
-                dbc.CardBody([
-                    html.H6("Lowest Mall in Sales", className="text-info"),
-                    html.H3(f'', id='min-sales-mall'),
-                ], style={"background-color": "#000", "text-align": "center", "border":"1px solid darkblue", "border-radius": "10px"})
-            ),
-        ], ),
-
-
-    ], style={"margin-bottom": "20px"}),
-
-
-    # bar Chart of Genders for Each Mall
-    dbc.Row([
-        dbc.Col([
-            dcc.Graph(id = "bar-chart-mall-gender", style={"margin-bottom": "20px", "height": "550px"})
-        ], width = 12),
-    ], style={"border-bottom" : "1px solid darkcyan"}),
-
-    # scatter Plot
-    dbc.Row([
-        dbc.Col([
-            dcc.Graph(id = "scatter-mall-category", style={"margin-top": "20px", "height": "700px"})
+                "color": "white",
+                "text-align": "center",
+                "margin-top": "20px",
+                "margin-bottom": "20px"
+            }),
+        ]),
+
+        # Drop Down Menu
+        dbc.Row([
+            html.Br(),
+            dcc.Dropdown(
+                id = "malls-menu",
+                options=[
+
+                    {"label": html.Span([i], style={'color': 'violet', 'font-size': 20}), "value": i,} for i in  drop_down_options
+                ],
+                value = [],
+                multi=True,
+                searchable=True,
+                placeholder= "Selct a Shopping Mall",
+                clearable=True,
+                style={
+                    "color":"white",
+                    "border": "0px",
+                    "font-family": "tahoma",
+                    "margin-bottom": "15px",
+                    "background-color": "black"
+                },
+            )
         ]),
 
-    ]),
-])
+        # Download The Transactions Of The Selected Malls
+        dbc.Row([
+            dbc.Col([
+                html.A("Download CSV", id="malls-export-csv", href=export.export_url("csv"), download="",
+                       className="btn btn-outline-info btn-sm", style={"margin-right": "10px"}),
+                html.A("Download Parquet", id="malls-export-parquet", href=export.export_url("parquet"), download="",
+                       className="btn btn-outline-info btn-sm", style={} if export.PARQUET else {"display": "none"}),
+            ], style={"text-align": "right"}),
+        ], style={"margin-bottom": "15px"}),
+
+        # Card
+        dbc.Row([
+            dbc.Col([
+                dbc.Card(
+                    dbc.CardBody([
+                        html.H6("Top Mall in Sales", className="text-info"),
+                        html.H3(f'', id='max-sales-mall')
+                    ], style={"background-color": "#000", "text-align": "center", "border":"1px solid darkblue", "border-radius": "10px"})
+                ),
+            ], ),
+
+            dbc.Col([
+                dbc.Card(
+                    dbc.CardBody([
+                        html.H6("Lowest Mall in Sales", className="text-info"),
+                        html.H3(f'', id='min-sales-mall'),
+                    ], style={"background-color": "#000", "text-align": "center", "border":"1px solid darkblue", "border-radius": "10px"})
+                ),
+            ], ),
+
+
+        ], style={"margin-bottom": "20px"}),
+
+
+        # bar Chart of Genders for Each Mall
+        dbc.Row([
+            dbc.Col([
+                dcc.Graph(id = "bar-chart-mall-gender", style={"margin-bottom": "20px", "height": "550px"})
+            ], width = 12),
+        ], style={"border-bottom" : "1px solid darkcyan"}),
+
+        # scatter Plot
+        dbc.Row([
+            dbc.Col([
+                dcc.Graph(id = "scatter-mall-category", style={"margin-top": "20px", "height": "700px"})
+            ]),
+
+        ], style={"border-bottom" : "1px solid darkcyan"}),
+
+        # Price & Age Distributions Of The Selected Malls
+        dbc.Row([
+            dbc.Col([
+                dcc.Graph(id = "box-chart-mall-price", style={"margin-top": "20px"})
+            ]),
+
+            dbc.Col([
+                dcc.Graph(id = "histogram-mall-age", style={"margin-top": "20px"})
+            ]),
+        ]),
+    ])
 
 
 # ------------------------------ Callbacks ------------------------------
 
+# Download Links Follow The Mall Selection
+@callback(
+    Output(component_id= "malls-export-csv", component_property="href"),
+    Output(component_id= "malls-export-parquet", component_property="href"),
+    Input(component_id= "malls-menu", component_property="value"),
+)
+@instrument
+def set_export_links(option):
+    return export.export_url("csv", shopping_mall=option or []), export.export_url("parquet", shopping_mall=option or [])
+
+
 # bar Chart Count For Each Gender Via Malls
 @callback(
     Output(component_id= "max-sales-mall", component_property="children"),
     Output(component_id= "min-sales-mall", component_property="children"),
     Input(component_id= "malls-menu", component_property="value"),
 )
+@instrument
+@memoize
 def build_max_min_card(option):
-    if len(option) == 0:
-        top_mall = df.groupby("shopping_mall")["total_price"].sum().idxmax()
-        lowest_mall = df.groupby("shopping_mall")["total_price"].sum().idxmin()
-
-    else:
-        filt = df["shopping_mall"].isin(option)
-        df_filttered = df[filt]
-        top_mall = df_filttered.groupby("shopping_mall")["total_price"].sum().idxmax()
-        lowest_mall = df_filttered.groupby("shopping_mall")["total_price"].sum().idxmin()
+    top_mall, lowest_mall = query.top_bottom_mall(option)
 
     # Bar Chart For Mall By Gender
     return top_mall, lowest_mall
@@ -144,80 +155,140 @@ def build_max_min_card(option):
 
 
 # bar Chart Count For Each Gender Via Malls
+figures.define("bar-chart-mall-gender",
+    trace={
+        "type": "bar",
+        "textposition": "inside",
+        "texttemplate": "%{y:0.3s}",
+        "insidetextfont": {"family": "consolas", "size": 12},
+    },
+    layout={"barmode": "group", "xaxis_title": "Mall", "yaxis_title": "Counts", "legend_title": "Gender"},
+)
+
+
 @callback(
     Output(component_id= "bar-chart-mall-gender", component_property="figure"),
     Input(component_id= "malls-menu", component_property="value"),
 )
+@instrument
+@memoize
 def build_bar_mall_gender(option):
+    pivot_mall_gender = query.gender_counts(option)
+
     if len(option) == 0:
-        pivot_mall_gender = df.pivot_table(index = "shopping_mall",
-                                           columns = df["gender"],
-                                           values = "gender",
-                                           aggfunc = "count")
         msg_title = "Counts of Gender per Each Mall"
 
-
     else:
-        filt = df["shopping_mall"].isin(option)
-        df_filttered = df[filt]
-        pivot_mall_gender = df_filttered.pivot_table(index = "shopping_mall",
-                                                     columns = df["gender"],
-                                                     values = "gender",
-                                                     aggfunc="count")
         msg_title = f"Counts of Gender per {', '.join(option)}" if len(option) <= 2 else "Counts of Gender per Each Mall"
 
 
     pivot_mall_gender = pivot_mall_gender.sort_values(by = "Female", ascending=False)
+    malls = pivot_mall_gender.index.astype(str).tolist()
 
-    # Bar Chart For Mall By Gender
-    fig = px.bar(pivot_mall_gender,
-                 template="plotly_dark",
-                 barmode="group",
-                 text_auto="0.3s",
-                 color_discrete_sequence=user_colors,
-                 labels={"value": "Counts", "shopping_mall": "Mall", "gender":"Gender"},
-                 title=msg_title)
-
-    fig.update_traces(
-        textposition="inside",
-        insidetextfont={
-            "family": "consolas",
-            "size": 12,
-        }
-    )
-
-    return fig
+    # Bar Chart For Mall By Gender (One Trace Per Gender)
+    return figures.figure("bar-chart-mall-gender", [{
+        "name": str(gender),
+        "x": malls,
+        "y": pivot_mall_gender[gender].to_numpy(),
+        "marker": {"color": user_colors[i % len(user_colors)]},
+        "hovertemplate": f"Gender={gender}<br>Mall=%{{x}}<br>Counts=%{{y}}<extra></extra>",
+    } for i, gender in enumerate(pivot_mall_gender.columns)], title=msg_title)
 
 # Scatter Plot Counts of Catgorry Per Mall
+figures.define("scatter-mall-category",
+    trace={"type": "bar"},
+    layout={"barmode": "relative", "xaxis_title": "Mall", "yaxis_title": "quantity", "legend_title": "Category"},
+)
+
+
 @callback(
     Output(component_id= "scatter-mall-category", component_property="figure"),
     Input(component_id= "malls-menu", component_property="value"),
 )
+@instrument
+@memoize
 def build_scatter_mall_category(option):
+    group_mall_category = query.category_quantity(option)
+
     if len(option) == 0:
-        group_mall_category = df.groupby(["shopping_mall", "category"],
-                                         as_index=False)["quantity"].sum()
         msg_title = "Quantity Sold Per Each Category In Each Mall"
 
     else:
-        filt = df["shopping_mall"].isin(option)
-        df_filttered = df[filt]
-
-        group_mall_category = df_filttered.groupby(["shopping_mall", "category"],
-                                                   as_index=False)["quantity"].sum()
-
         msg_title = f"Quantity Sold Per Each Category In  {', '.join(option)}" if len(option) <= 2 else "Quantity Sold Per Each Category In Each Mall"
 
     group_mall_category = group_mall_category.sort_values(by = "quantity", ascending=False)
 
-    fig_scatter = px.bar(data_frame=group_mall_category,
-                     x="shopping_mall",
-                     y="quantity",
-                     color="category",
-                     template="plotly_dark",
-                     title=msg_title,
-                     labels = {"category":"Category", "shopping_mall":"Mall"}
-                     )
+    # One Stacked Trace Per Category, In Order Of Appearance (Colors From The Template)
+    traces = []
+    for category, rows in group_mall_category.groupby("category", observed=True, sort=False):
+        traces.append({
+            "name": str(category),
+            "x": rows["shopping_mall"].astype(str).tolist(),
+            "y": rows["quantity"].to_numpy(),
+            "hovertemplate": f"Category={category}<br>Mall=%{{x}}<br>quantity=%{{y}}<extra></extra>",
+        })
+
+    return figures.figure("scatter-mall-category", traces, title=msg_title)
+
+
+# Price Percentiles per Category In The Selected Malls
+figures.define("box-chart-mall-price",
+    trace={"type": "box", "marker": {"color": user_colors[0]}},
+    layout={"showlegend": False, "xaxis_title": "Category", "yaxis_title": "Price in Liras", "yaxis_type": "log"},
+)
+
+
+@callback(
+    Output(component_id= "box-chart-mall-price", component_property="figure"),
+    Input(component_id= "malls-menu", component_property="value"),
+)
+@instrument
+@memoize
+def build_price_distribution(option):
+    price_quantiles = query.price_quantiles([0.05, 0.25, 0.5, 0.75, 0.95], malls=option)
+
+    if len(option) == 0:
+        msg_title = "Price Percentiles Per Category In Each Mall (5-25-50-75-95%)"
 
+    else:
+        msg_title = f"Price Percentiles Per Category In {', '.join(option)}" if len(option) <= 2 else "Price Percentiles Per Category In Selected Malls"
+
+    # Box Chart From Precomputed Percentiles (Whiskers At 5% & 95%)
+    return figures.figure("box-chart-mall-price", [{
+        "x": price_quantiles.index.astype(str).tolist(),
+        "lowerfence": price_quantiles[0.05].to_numpy(),
+        "q1": price_quantiles[0.25].to_numpy(),
+        "median": price_quantiles[0.5].to_numpy(),
+        "q3": price_quantiles[0.75].to_numpy(),
+        "upperfence": price_quantiles[0.95].to_numpy(),
+    }], title=msg_title)
+
+
+# Histogram Of Customer Ages In The Selected Malls
+figures.define("histogram-mall-age",
+    trace={
+        "type": "bar",
+        "marker": {"color": user_colors[2]},
+        "hovertemplate": "Age=%{x}<br>Invoices=%{y}<extra></extra>",
+    },
+    layout={"bargap": 0.05, "xaxis_title": "Age", "yaxis_title": "Invoices"},
+)
+
+
+@callback(
+    Output(component_id= "histogram-mall-age", component_property="figure"),
+    Input(component_id= "malls-menu", component_property="value"),
+)
+@instrument
+@memoize
+def build_age_histogram(option):
+    ages = query.age_histogram(malls=option)
+    median_age = ages.index[np.searchsorted(ages.cumsum().to_numpy(), ages.sum() / 2)]
+
+    if len(option) == 0:
+        msg_title = f"Invoices Per Customer Age In Each Mall (Median {median_age})"
+
+    else:
+        msg_title = f"Invoices Per Customer Age In {', '.join(option)} (Median {median_age})" if len(option) <= 2 else f"Invoices Per Customer Age In Selected Malls (Median {median_age})"
 
-    return fig_scatter
\ No newline at end of file
+    return figures.figure("histogram-mall-age", [{"x": ages.index.to_numpy(), "y": ages.to_numpy()}], title=msg_title)